@@ -0,0 +1,161 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+ADAPTIVE_WAITS_FILE = 'adaptive_waits.json'
+WAIT_HISTORY = 200
+WAIT_MIN_SAMPLES = 10
+WAIT_QUANTILE = 0.99
+WAIT_MARGIN = 1.5
+WAIT_MIN_TIMEOUT = 1.0
+WAIT_PROBE_TIMEOUT = 1.0
+WAIT_RARE_RATE = 0.2
+WAIT_EXPLORE_RATE = 0.05
+WAIT_POLL_INTERVAL = 0.1
+
+class SelectorStats:
+    """
+    Recent outcomes (present or not) and appearance latencies for one selector,
+    and the deadline floor left by a wait that ran out before its default timeout.
+    """
+
+    def __init__(self, outcomes=(), latencies=(), floor=0.0):
+        self.outcomes = deque(outcomes, maxlen=WAIT_HISTORY)
+        self.latencies = deque(latencies, maxlen=WAIT_HISTORY)
+        self.floor = floor
+
+    @property
+    def presence_rate(self):
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 1.0
+
+    def latency_quantile(self, quantile):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+class AdaptiveWaits:
+    """
+    Per-selector wait deadlines learned from observed page timings. Until a
+    selector has WAIT_MIN_SAMPLES outcomes it gets the caller's default timeout.
+    After that its deadline is the p99 appearance time with a margin, and a
+    selector that is rarely present gets a short probe. A few waits run with
+    the full default timeout anyway, so late elements keep being observed.
+    Only a wait that ran to the default timeout counts as absent: one that ran
+    out of a shorter learned deadline just shows the element can be later, so
+    it doubles the next deadline instead of lowering the presence rate.
+    """
+
+    def __init__(self, path=ADAPTIVE_WAITS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self._stats = {key: SelectorStats(entry['outcomes'], entry['latencies'], entry.get('floor', 0.0))
+                           for key, entry in data.items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            self._stats = {}
+
+    def save(self):
+        """Write the observed timings to disk if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {key: {'outcomes': list(stats.outcomes), 'latencies': [round(x, 3) for x in stats.latencies],
+                          'floor': round(stats.floor, 3)}
+                    for key, stats in self._stats.items()}
+            self._dirty = False
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def timeout_for(self, key, default_timeout):
+        """Deadline in seconds for the next wait on key."""
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None or len(stats.outcomes) < WAIT_MIN_SAMPLES or random.random() < WAIT_EXPLORE_RATE:
+                return default_timeout
+            if stats.presence_rate < WAIT_RARE_RATE:
+                return min(WAIT_PROBE_TIMEOUT, default_timeout)
+            quantile = stats.latency_quantile(WAIT_QUANTILE)
+            floor = stats.floor
+        if quantile is None:
+            return min(WAIT_PROBE_TIMEOUT, default_timeout)
+        return min(default_timeout, max(WAIT_MIN_TIMEOUT, quantile * WAIT_MARGIN, floor))
+
+    def record(self, key, present, latency=None, deadline=None):
+        """
+        Record one wait on key. deadline is the shortened deadline a missed wait
+        ran out of, or None when it waited the full default timeout.
+        """
+        with self._lock:
+            stats = self._stats.setdefault(key, SelectorStats())
+            if present:
+                stats.outcomes.append(1)
+                stats.latencies.append(latency)
+                stats.floor = 0.0
+            elif deadline is None:
+                stats.outcomes.append(0)
+                stats.floor = 0.0
+            elif stats.presence_rate >= WAIT_RARE_RATE:
+                # Censored: the element may only be later than the learned deadline
+                stats.floor = deadline * 2
+            self._dirty = True
+
+    def until(self, driver, key, condition, default_timeout=20):
+        """
+        WebDriverWait(driver, timeout).until(condition) with the learned timeout
+        for key. Records whether and how fast the condition was met, and raises
+        TimeoutException like WebDriverWait when it wasn't.
+        """
+        timeout = self.timeout_for(key, default_timeout)
+        start = time.monotonic()
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_INTERVAL).until(condition)
+        except TimeoutException:
+            self.record(key, False, deadline=timeout if timeout < default_timeout else None)
+            raise
+        self.record(key, True, time.monotonic() - start)
+        return result
+
+    def snapshot(self):
+        """Return one row per selector key: samples, presence rate and p50/p99 appearance latency."""
+        with self._lock:
+            rows = []
+            for key, stats in sorted(self._stats.items()):
+                p50 = stats.latency_quantile(0.5)
+                p99 = stats.latency_quantile(WAIT_QUANTILE)
+                rows.append({
+                    'selector': key,
+                    'samples': len(stats.outcomes),
+                    'presence_rate': round(stats.presence_rate, 3),
+                    'p50_s': round(p50, 3) if p50 is not None else None,
+                    'p99_s': round(p99, 3) if p99 is not None else None,
+                })
+        return rows
+
+_waits = None
+_waits_lock = threading.Lock()
+
+def get_adaptive_waits():
+    """Return the process-wide adaptive wait manager, loading saved timings on first use."""
+    global _waits
+    with _waits_lock:
+        if _waits is None:
+            _waits = AdaptiveWaits()
+        return _waits
@@ -2,28 +2,13 @@ import streamlit as st
 # Set page config first, before any other st commands
 st.set_page_config(page_title="ResumeATS Pro", layout="wide")
 
-import configparser
 import os
 from dotenv import load_dotenv
-import google.generativeai as genai
-from PyPDF2 import PdfReader
-import re
-from collections import Counter
-import hashlib
-import plotly.graph_objects as go
-import numpy as np
-from database import init_db, create_user, verify_user, get_data
-from webdriver_manager.chrome import ChromeDriverManager
-
-import time
-from datetime import datetime
-
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+# Only lightweight modules here: the login page needs nothing else. Each feature
+# imports its heavy dependencies (Gemini SDK, Selenium, NumPy, Plotly, PyPDF2) itself.
+from database import init_db, create_user
+from auth import login, logout, session_user
+from cache import init_cache
 
 # Custom CSS for Apple-inspired design
 st.markdown("""
@@ -46,14 +31,36 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+MODEL_NAME = "gemini-2.0-flash"
+# Long-running analyses whose responses are rendered while they stream in
+STREAMED_ANALYSES = ("Detailed Analysis", "ATS Optimization")
+AUTO_APPLY_POLL_INTERVAL = 3
+
+@st.cache_resource
+def init_storage():
+    """Create the database tables once per process instead of on every rerun."""
+    init_db()
+    init_cache()
+
+@st.cache_resource
+def get_gemini_client(model_name):
+    """Configure the Gemini SDK and build the shared client once per process."""
+    import google.generativeai as genai
+    from gemini_client import get_client
+    load_dotenv()
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    return get_client(model_name)
+
 # Initialize database
-init_db()
+init_storage()
 
 # Initialize session state
 if 'authenticated' not in st.session_state:
     st.session_state.authenticated = False
 if 'username' not in st.session_state:
     st.session_state.username = None
+if 'auth_token' not in st.session_state:
+    st.session_state.auth_token = None
 if 'pdf_text' not in st.session_state:
     st.session_state.pdf_text = None
 
@@ -67,7 +74,10 @@ def show_auth_ui():
         login_password = st.text_input("Password", type="password", key="login_password")
         chromedriver_path = st.text_input("Chrome Driver Path", key="chromedriver_path")
         if st.button("Login"):
-            if verify_user(login_email, login_password):  # Use email for verification
+            with st.spinner("Signing in..."):
+                token = login(login_email, login_password)
+            if token:
+                st.session_state.auth_token = token
                 st.session_state.authenticated = True
                 st.session_state.username = login_email  # Store email in session state
                 st.session_state.password = login_password  # Store password in session state
@@ -96,11 +106,19 @@ def show_auth_ui():
                     st.error("Email already exists")
 
 # Main app logic
+# Reruns only look up the session token; the password is checked once at login
+if st.session_state.authenticated and session_user(st.session_state.auth_token) is None:
+    st.session_state.authenticated = False
+    st.session_state.username = None
+    st.session_state.auth_token = None
+    st.info("Your session expired. Please log in again.")
 if not st.session_state.authenticated:
     show_auth_ui()
 else:
     # Show logout button in sidebar
     if st.sidebar.button("Logout"):
+        logout(st.session_state.auth_token)
+        st.session_state.auth_token = None
         st.session_state.authenticated = False
         st.session_state.username = None
         st.rerun()
@@ -110,80 +128,32 @@ else:
     # Add feature selector
     feature = st.selectbox(
         "Select Feature",
-        ["Resume ATS Pro", "Auto Apply"],
+        ["Resume ATS Pro", "Batch Screening", "Auto Apply", "Application Dashboard"],
         index=0
     )
     
     if feature == "Resume ATS Pro":
-        # Load environment variables and configure API
-        load_dotenv()
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-        model = genai.GenerativeModel("gemini-2.0-flash")
-
-        # Add new scoring helper functions
-        def calculate_keyword_match(text, keywords):
-            """Calculate keyword match percentage"""
-            text = text.lower()
-            found_keywords = sum(1 for keyword in keywords if keyword.lower() in text)
-            return (found_keywords / len(keywords)) * 100 if keywords else 0
-
-        def normalize_score(score):
-            """Normalize score to prevent outliers"""
-            return min(max(score, 0), 100)
-
-        def get_cached_score(pdf_text, job_description=None):
+        import plotly.graph_objects as go
+        from pdf_utils import read_pdf
+        from ats_scoring import calculate_base_ats_score, normalize_score
+        from skill_matching import match_percentage as skills_match_percentage
+        from skill_profile import load_skill_profile, extract_profile_locally
+        from cache import make_cache_key, get_cached_analysis, cache_analysis, get_cache_stats
+
+        gemini = get_gemini_client(MODEL_NAME)
+
+        def get_cached_score(pdf_text, job_description=None, analysis_option=None, prompt=""):
             """Get cached score or None"""
             if not pdf_text:
                 return None
-            # Create unique hash for the resume and job description combination
-            content_hash = hashlib.md5((pdf_text + (job_description or "")).encode()).hexdigest()
-            return st.session_state.get(f'score_{content_hash}')
+            # Persistent cache shared across sessions, keyed on resume, JD, analysis type and model
+            cache_key = make_cache_key(pdf_text, job_description, analysis_option, MODEL_NAME, prompt)
+            return get_cached_analysis(cache_key)
 
-        def cache_score(pdf_text, score, job_description=None):
+        def cache_score(pdf_text, score, job_description=None, analysis_option=None, prompt=""):
             """Cache the score"""
-            content_hash = hashlib.md5((pdf_text + (job_description or "")).encode()).hexdigest()
-            st.session_state[f'score_{content_hash}'] = score
-
-        class ATSScoreComponents:
-            def _init_(self):  # Fixed constructor method
-                self.format_score = 0
-                self.content_score = 0
-                self.keyword_score = 0
-                self.match_score = 0
-                self.total_score = 0
-
-        def calculate_base_ats_score(pdf_text, job_description=None):
-            """Calculate unified ATS score and return components"""
-            score_components = ATSScoreComponents()
-            
-            # Basic Resume Structure (40 points)
-            sections = ['experience', 'education', 'skills']
-            for section in sections:
-                if section in pdf_text.lower():
-                    score_components.format_score += 10
-            
-            # Clean formatting check
-            if len(re.findall(r'[^\x00-\x7F]', pdf_text)) == 0:
-                score_components.format_score += 5
-            if len(re.findall(r'[^\S\n]{2,}', pdf_text)) == 0:
-                score_components.format_score += 5
-
-            # Content Quality
-            action_verbs = ['achieved', 'implemented', 'developed', 'managed', 'created', 'increased']
-            score_components.keyword_score = calculate_keyword_match(pdf_text, action_verbs)
-            score_components.content_score = score_components.keyword_score * 0.2
-
-            # Job description matching
-            if job_description:
-                job_terms = set(re.findall(r'\b\w+\b', job_description.lower()))
-                resume_terms = set(re.findall(r'\b\w+\b', pdf_text.lower()))
-                score_components.match_score = len(job_terms.intersection(resume_terms)) / len(job_terms) * 30
-                score_components.content_score += score_components.match_score
-            else:
-                score_components.content_score += 30 if len(pdf_text.split()) > 200 else 15
-
-            score_components.total_score = normalize_score(score_components.format_score + score_components.content_score)
-            return score_components
+            cache_key = make_cache_key(pdf_text, job_description, analysis_option, MODEL_NAME, prompt)
+            cache_analysis(cache_key, score)
 
         def display_score_visualization(score_components, analysis_components):
             """Display visual representation of ATS score"""
@@ -219,18 +189,21 @@ else:
             
             st.plotly_chart(fig, use_container_width=True)
 
-        def get_gemini_output(pdf_text, prompt):
-            """Enhanced Gemini output with score visualization"""
-            cached_score = get_cached_score(pdf_text, prompt)
+        def get_gemini_output(pdf_text, prompt, analysis_option, stream=False):
+            """
+            Enhanced Gemini output with score visualization.
+            With stream=True the results are rendered here as they arrive.
+            """
+            cached_score = get_cached_score(pdf_text, job_description if use_jd else None, analysis_option, prompt)
             if cached_score:
+                if stream:
+                    st.subheader("Analysis Results")
+                    st.write(cached_score)
                 return cached_score
             
             score_components = calculate_base_ats_score(pdf_text, job_description if use_jd else None)
             
             try:
-                response = model.generate_content([pdf_text, prompt])
-                response_text = response.text
-                
                 # Calculate component scores
                 analysis_components = {
                     'Resume Structure': normalize_score(score_components.format_score * 2.5),
@@ -240,9 +213,21 @@ else:
                 
                 if use_jd:
                     analysis_components['Job Description Match'] = normalize_score(score_components.match_score * 3.33)
+                    # Known skills named in the JD that the stored resume skill profile covers
+                    jd_skills = extract_profile_locally(job_description)['skills']
+                    if jd_skills:
+                        analysis_components['Skills Match'] = skills_match_percentage(jd_skills, load_skill_profile(pdf_text, gemini)['skills'])
                 
-                # Display visualization with consistent scoring
-                display_score_visualization(score_components, analysis_components)
+                if stream:
+                    # Show the scores first so the analysis streams in below them
+                    display_score_visualization(score_components, analysis_components)
+                    st.subheader("Analysis Results")
+                    st.write(f"ATS Compatibility Score: {score_components.total_score:.1f}/100")
+                    response_text = st.write_stream(gemini.stream([pdf_text, prompt]))
+                else:
+                    response_text = gemini.generate([pdf_text, prompt])
+                    # Display visualization with consistent scoring
+                    display_score_visualization(score_components, analysis_components)
                 
                 enhanced_response = f"""
         Score Summary:
@@ -251,24 +236,13 @@ else:
         Detailed Analysis:
         {response_text}
         """
-                cache_score(pdf_text, enhanced_response, prompt)
+                cache_score(pdf_text, enhanced_response, job_description if use_jd else None, analysis_option, prompt)
                 return enhanced_response
                 
             except Exception as e:
                 st.error(f"Error in generating response: {str(e)}")
                 return None
 
-        # Initialize session state for caching if not exists
-        if 'score_cache' not in st.session_state:
-            st.session_state.score_cache = {}
-
-        # Function to read PDF
-        def read_pdf(uploaded_file):
-            if uploaded_file is not None:
-                pdf_reader = PdfReader(uploaded_file)
-                return "".join([page.extract_text() for page in pdf_reader.pages])
-            raise FileNotFoundError("No file uploaded")
-
         # File upload
         upload_file = st.file_uploader("Upload your resume (PDF)", type=["pdf"])
 
@@ -393,23 +367,29 @@ else:
                     Resume text: {pdf_text}
                     {f'Job Description: {job_description}' if use_jd else ''}
                     """
-                response = get_gemini_output(pdf_text, prompt)
+                stream_results = analysis_option in STREAMED_ANALYSES
+                response = get_gemini_output(pdf_text, prompt, analysis_option, stream=stream_results)
                 
-                st.subheader("Analysis Results")
-                st.write(response)
+                if not stream_results:
+                    st.subheader("Analysis Results")
+                    st.write(response)
                 
                 # Option to chat about the resume
                 st.subheader("Have questions about your resume?")
                 user_question = st.text_input("Ask me anything about your resume or the analysis:")
                 if user_question:
+                    skill_profile = load_skill_profile(pdf_text, gemini)
                     chat_prompt = f"""
                     Based on the resume and analysis above, answer the following question:
                     {user_question}
                     
+                    Candidate skills: {', '.join(skill_profile['skills'])}
+                    Years of experience: {skill_profile['years_experience']:g}
+                    Titles held: {', '.join(skill_profile['titles'])}
                     Resume text: {pdf_text}
                     Previous analysis: {response}
                     """
-                    chat_response = get_gemini_output(pdf_text, chat_prompt)
+                    chat_response = get_gemini_output(pdf_text, chat_prompt, f"Chat: {analysis_option}")
                     st.write(chat_response)
             else:
                 st.error("Please upload a resume to analyze.")
@@ -426,23 +406,134 @@ else:
         st.sidebar.title("Feedback")
         st.sidebar.text_area("Help us improve! Leave your feedback:")
         st.sidebar.button("Submit Feedback")
+
+        cache_stats = get_cache_stats()
+        st.sidebar.caption(
+            f"Analysis cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses, "
+            f"{cache_stats['entries']} entries"
+        )
         
+    elif feature == "Batch Screening":
+        st.title("Batch Resume Screening")
+        st.subheader("Rank many resumes against one job description")
+
+        from batch_screening import (
+            BATCH_TOP_K, resume_sources, extract_resume_texts, rank_resumes, analyze_top_candidates, ranking_to_csv
+        )
+
+        gemini = get_gemini_client(MODEL_NAME)
+
+        source_type = st.radio("Resume source:", ["Upload PDFs", "Zip archive", "Server directory"])
+        uploaded_resumes, resume_zip, resume_dir = None, None, None
+        if source_type == "Upload PDFs":
+            uploaded_resumes = st.file_uploader("Upload resumes (PDF)", type=["pdf"], accept_multiple_files=True)
+        elif source_type == "Zip archive":
+            resume_zip = st.file_uploader("Upload a zip of resumes", type=["zip"])
+        else:
+            resume_dir = st.text_input("Directory containing resume PDFs")
+
+        batch_job_description = st.text_area("Enter the job description", height=200, key="batch_job_description")
+        top_k = st.number_input("Resumes to analyze in detail with Gemini (top K)", min_value=0, max_value=50, step=1, value=BATCH_TOP_K)
+
+        if st.button("Screen Resumes"):
+            if not batch_job_description.strip():
+                st.error("Please enter a job description.")
+                st.stop()
+            if resume_dir and not os.path.isdir(resume_dir):
+                st.error("Directory not found.")
+                st.stop()
+            sources = resume_sources(uploaded_resumes, resume_dir, resume_zip)
+            if not sources:
+                st.error("No PDF resumes found.")
+                st.stop()
+
+            progress = st.progress(0.0, text="Extracting resume text...")
+            resumes, extraction_errors = [], []
+            for done, (name, text, error) in enumerate(extract_resume_texts(sources), start=1):
+                if error:
+                    extraction_errors.append(f"{name}: {error}")
+                else:
+                    resumes.append((name, text))
+                progress.progress(done / len(sources), text=f"Extracted {done}/{len(sources)} resumes")
+
+            rows = rank_resumes(resumes, batch_job_description)
+            analyses = {}
+            if top_k and rows:
+                with st.spinner(f"Analyzing the top {min(top_k, len(rows))} resumes with Gemini..."):
+                    try:
+                        analyses = analyze_top_candidates(gemini, rows, dict(resumes), batch_job_description, top_k)
+                    except Exception as e:
+                        st.error(f"Error in generating response: {str(e)}")
+            for row in rows:
+                row['analysis'] = analyses.get(row['resume'], "")
+            progress.empty()
+
+            st.markdown(f"### Ranked {len(rows)} resumes")
+            if extraction_errors:
+                st.warning(f"Could not read {len(extraction_errors)} files: " + "; ".join(extraction_errors[:10]))
+            st.dataframe(rows, use_container_width=True,
+                         column_order=['rank', 'resume', 'ats_score', 'jd_match', 'format_score', 'keyword_score', 'words', 'analysis'])
+            st.download_button("Download CSV", ranking_to_csv(rows), file_name="resume_ranking.csv", mime="text/csv")
+
     elif feature == "Auto Apply":
         st.title("Auto Apply")
         st.subheader("Automatically Apply to Jobs on Naukri.com")
         
-        load_dotenv()
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-        model = genai.GenerativeModel("gemini-2.0-flash")
+        from pdf_utils import read_pdf
+        from skill_profile import load_skill_profile
+        from database import get_auto_apply_runs, get_auto_apply_run_events
+        from auto_apply import SEARCH_POOL_SIZE, DETAIL_FETCHERS, RANKED_APPLY
+        from job_runner import get_job_runner
+
+        gemini = get_gemini_client(MODEL_NAME)
+        
+        credentials = {
+            'email': st.session_state.get('username'),
+            'password': st.session_state.get('password')
+        }
+        job_runner = get_job_runner()
+
+        @st.fragment(run_every=AUTO_APPLY_POLL_INTERVAL)
+        def show_auto_apply_runs():
+            """Poll the user's recent background runs and show their progress."""
+            runs = get_auto_apply_runs(credentials['email'], limit=5)
+            if not runs:
+                return
+            st.markdown("### Your Auto Apply Runs")
+            for run in runs:
+                progress = run['progress']
+                max_applications = run['params']['max_applications']
+                applied = progress.get('applied', 0)
+                active = run['status'] in ('queued', 'running')
+                with st.expander(f"Run #{run['id']} ({run['created_at']}): {run['status']}", expanded=active):
+                    st.progress(min(applied / max_applications, 1.0) if max_applications else 0.0)
+                    st.write(f"Stage: {progress.get('stage', run['status'])} | Job links: {progress.get('links', 0)} | "
+                             f"Applied: {applied}/{max_applications} | Failed: {progress.get('failed', 0)}")
+                    if run['error']:
+                        st.error(run['error'])
+                    events = get_auto_apply_run_events(run['id'], limit=20)
+                    if events:
+                        st.code("\n".join(f"{created_at}  {message}" for created_at, message in events))
+                    if progress.get('timings'):
+                        st.caption("Time per stage (seconds)")
+                        st.dataframe(progress['timings'], hide_index=True, use_container_width=True)
+                    if active and not run['cancel_requested']:
+                        if st.button("Cancel", key=f"cancel_run_{run['id']}"):
+                            job_runner.cancel(run['id'])
+                            st.rerun(scope="fragment")
+                    elif active:
+                        st.write("Cancelling...")
+                    if run['status'] == 'interrupted':
+                        st.write("This run was interrupted by a restart. Resume continues from its last checkpoint.")
+                        if st.button("Resume", key=f"resume_run_{run['id']}"):
+                            job_runner.resume(run['id'], credentials)
+                            st.rerun(scope="fragment")
+
+        show_auto_apply_runs()
         
         # Resume upload for Auto Apply
         auto_apply_resume = st.file_uploader("Upload Resume for Auto Apply", type=["pdf"])
         if auto_apply_resume:
-            def read_pdf(uploaded_file):
-                if uploaded_file is not None:
-                    pdf_reader = PdfReader(uploaded_file)
-                    return "".join([page.extract_text() for page in pdf_reader.pages])
-                raise FileNotFoundError("No file uploaded")
             st.session_state.pdf_text = read_pdf(auto_apply_resume)
             
         if 'pdf_text' not in st.session_state or not st.session_state.pdf_text:
@@ -458,302 +549,71 @@ else:
             salary = st.number_input("Expected Salary", min_value=0)
             max_pages = st.number_input("Max Pages to Search", min_value=1, step=1)
             min_match_score = st.number_input("Minimum Job Description Match Score (0 - 1)", min_value=0.0, max_value=1.0, step=0.1, value=0.0)
+            search_browsers = st.number_input("Parallel Search Browsers", min_value=1, max_value=8, step=1, value=SEARCH_POOL_SIZE)
+            detail_browsers = st.number_input("Parallel Job Detail Browsers (0 = sequential)", min_value=0, max_value=8, step=1, value=DETAIL_FETCHERS)
+            rank_jobs = st.checkbox("Apply to the best matches first (checks the jobs before applying)", value=RANKED_APPLY)
+            verbose = st.checkbox("Verbose progress log (every search page and job)")
             submitted = st.form_submit_button("Start Auto Apply")
         
         if submitted:
             designations = [d.strip() for d in designation_input.split(",") if d.strip()]
             locations = [l.strip() for l in location_input.split(",") if l.strip()]
+            params = {
+                'job_type': job_type,
+                'designations': designations,
+                'locations': locations,
+                'max_applications': int(max_applications),
+                'yoe': int(yoe),
+                'salary': float(salary),
+                'max_pages': int(max_pages),
+                'min_match_score': float(min_match_score),
+                'search_browsers': int(search_browsers),
+                'detail_browsers': int(detail_browsers),
+                'rank_jobs': rank_jobs,
+                'verbose': verbose,
+                # Stored per resume, so only the first run for a resume calls Gemini
+                'user_skills': load_skill_profile(st.session_state.pdf_text, gemini)['skills']
+            }
+            run_id = job_runner.submit(credentials, params)
+            st.info(f"Auto apply run #{run_id} queued. It keeps running in the background if you leave or reload this page.")
+
+    elif feature == "Application Dashboard":
+        st.title("Application Dashboard")
+
+        from database import (get_application_daily_counts, get_application_reasons, get_match_score_distribution,
+                              get_applications, APPLICATION_SCORE_BUCKET)
+
+        user_email = st.session_state.username
+        days = st.slider("Days", min_value=1, max_value=365, value=30)
+        # All charts read the daily rollups, not the application log itself
+        daily_counts = get_application_daily_counts(user_email, days)
+        if not daily_counts:
+            st.info("No Auto Apply activity in this period yet.")
+            st.stop()
 
-            def login_naukri(driver, wait, credentials):
-                """Log into Naukri.com using provided credentials."""
-                driver.get('https://login.naukri.com/')
-                st.write("Checkpoint: Navigated to login page.")
-                try:
-                    wait.until(EC.presence_of_element_located((By.ID, 'usernameField'))).send_keys(credentials['email'])
-                    wait.until(EC.presence_of_element_located((By.ID, 'passwordField'))).send_keys(credentials['password'])
-                    wait.until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Login']"))).click()
-                    st.write("Checkpoint: Login successful.")
-                except Exception as e:
-                    st.write(f"Checkpoint: Login failed: {e}")
-                    driver.quit()
-                    exit()
-
-            def construct_url_for_combo(designation, location, job_type, page):
-                """Helper function to generate a URL for a single designation, location, and page."""
-                base_url = "https://www.naukri.com"
-                designation_slug = designation.lower().replace(' ', '-')
-                location_slug = location.lower().replace(' ', '-') if location else ""
-                
-                if job_type == "internship":
-                    if location_slug:
-                        url = (f"{base_url}/{designation_slug}-internship-jobs-in-{location_slug}"
-                            if page == 1 else
-                            f"{base_url}/internship/{designation_slug}-internship-jobs-in-{location_slug}-{page}")
-                    else:
-                        url = (f"{base_url}/{designation_slug}-internship-jobs"
-                            if page == 1 else
-                            f"{base_url}/internship/{designation_slug}-internship-jobs-{page}")
-                else:
-                    if location_slug:
-                        url = (f"{base_url}/{designation_slug}-jobs-in-{location_slug}"
-                            if page == 1 else
-                            f"{base_url}/{designation_slug}-jobs-in-{location_slug}-{page}")
-                    else:
-                        url = (f"{base_url}/{designation_slug}-jobs"
-                            if page == 1 else
-                            f"{base_url}/{designation_slug}-jobs-{page}")
-                return url
-
-            def construct_search_urls(designations, locations, job_type, max_pages):
-                """
-                For each combination of designation and location (both are lists of strings),
-                and for each page up to max_pages, generate a Naukri search URL.
-                """
-                urls = []
-                
-                for designation in designations:
-                    if locations:
-                        for location in locations:
-                            for page in range(1, max_pages + 1):
-                                url = construct_url_for_combo(designation, location, job_type, page)
-                                st.write(f"Checkpoint: Constructed URL: {url}")
-                                urls.append(url)
-                    else:
-                        for page in range(1, max_pages + 1):
-                            url = construct_url_for_combo(designation, "", job_type, page)
-                            st.write(f"Checkpoint: Constructed URL: {url}")
-                            urls.append(url)
-                            
-                return urls
-
-            def scrape_job_links(driver, wait, designations, locations, job_type, max_pages):
-                """Collect job links from search results for each designation and location combination."""
-                job_links = []
-                urls = construct_search_urls(designations, locations, job_type, max_pages)
-                
-                for url in urls:
-                    driver.get(url)
-                    st.write(f"Checkpoint: Navigated to search results: {url}")
-                    
-                    try:
-                        wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "span[title='Close']"))).click()
-                        st.write("Checkpoint: Closed a popup.")
-                    except Exception:
-                        pass
-                    
-                    try:
-                        jobs = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.title")))
-                        for job in jobs:
-                            job_url = job.get_attribute('href')
-                            if job_url and job_url not in job_links:
-                                job_links.append(job_url)
-                        st.write(f"Checkpoint: Found {len(jobs)} jobs on {url}")
-                    except TimeoutException:
-                        st.write(f"Checkpoint: No jobs found on {url}")
-                
-                st.write(f"Checkpoint: Total unique job links collected: {len(job_links)}")
-                return job_links
-
-            def extract_job_skills(driver, wait):
-                """
-                Attempt to locate and extract the 'Key Skills' from the job listing.
-                """
-                info = {
-                    'skill': [],
-                    'yoe': 0,
-                    'salary': [],
-                    'company_name': "Unknown Company",
-                    'designation': "Unknown Designation"
-                }
-                skill_texts = []
-                
-                try:
-                    parent_div = wait.until(EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, "div.styles_key-skill_GIPn")
-                    ))
-                    child_div = parent_div.find_element(By.XPATH, ".//div[not(@class)]")
-                    skill_spans = child_div.find_elements(By.TAG_NAME, "span")
-                    for span in skill_spans:
-                        text = span.text.strip().lower()
-                        if text:
-                            skill_texts.append(text)
-                    if skill_texts:
-                        st.write(f"Checkpoint: Found {len(skill_texts)} skills from primary structure.")
-                        info['skill'] = skill_texts
-                except Exception as e:
-                    info['skill'] = skill_texts
-
-                try:
-                    company_div = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located(
-                            (By.CSS_SELECTOR, "div.styles_jd-header-comp-name__MvqAI")
-                        )
-                    )
-                    try:
-                        company_name = company_div.find_element(By.TAG_NAME, "a").text.strip()
-                    except Exception as e:
-                        company_name = company_div.text.strip()
-                    info['company_name'] = company_name
-                except Exception as e:
-                    info['company_name'] = "Unknown Company"
-
-                try:
-                    designation_elem = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located(
-                            (By.CSS_SELECTOR, "h1.styles_jd-header-title__rZwM1")
-                        )
-                    )
-                    designation = designation_elem.text.strip()
-                    info['designation'] = designation
-                except Exception as e:
-                    info['designation'] = "Unknown Designation"
-
-                try:
-                    exp_div = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located(
-                            (By.CSS_SELECTOR, "div.styles_jhc_exp_k_giM")
-                        )
-                    )
-                    try:
-                        yoe_text = exp_div.find_element(By.TAG_NAME, "span").text.strip()
-                        info['yoe'] = int(yoe_text.split()[0])
-                    except Exception as e:
-                        try:
-                            info['yoe'] = int(exp_div.text.strip().split()[0])
-                        except Exception as e:
-                            info['yoe'] = 0
-                except Exception as e:
-                    info['yoe'] = 0
-
-                try:
-                    salary_div = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located(
-                            (By.CSS_SELECTOR, "div.styles_jhc_salary_jdfEC")
-                        )
-                    )
-                    try:
-                        salary_text = salary_div.find_element(By.TAG_NAME, "span").text.strip()
-                        info['salary'] = list(map(float, salary_text.split()[0].split('-')))
-                    except Exception as e:
-                        try:
-                            info['salary'] = list(map(float, salary_div.text.strip().split()[0].split('-')))
-                        except Exception as e:
-                            info['salary'] = [0, 0]
-                except Exception as e:
-                    info['salary'] = [0, 0]
-
-                return info
-
-            def skills_match(job_skills, user_skills):
-                """
-                Calculate the percentage of user skills that are mentioned in the job's skills.
-                Returns the match percentage.
-                """
-                if not job_skills:
-                    return 0
-                count = 0
-                for sk in job_skills:
-                    if sk in user_skills:
-                        count += 1
-                percentage = (count / len(job_skills)) * 100
-                st.write(f"Checkpoint: {percentage:.2f}% of user skills matched.")
-                return percentage
-
-            def apply_to_jobs(driver, wait, job_links, max_applications, yoe, salary, user_skills, min_match_score, expected_domain):
-                """Apply to jobs after checking the skills match and update the application log in the DB."""
-                applied = 0
-                failed = []
-                for job_url in job_links:
-                    if applied >= max_applications:
-                        st.write("Checkpoint: Reached daily application limit.")
-                        break
-                    driver.get(job_url)
-                    st.write(f"Checkpoint: Navigated to job posting: {job_url}")
-                    try:
-                        driver.find_element(By.XPATH, "//div[contains(text(), 'Applied')]")
-                        st.write(f"Checkpoint: Already applied to {job_url}")
-                        continue
-                    except NoSuchElementException:
-                        pass
-                    job_text = extract_job_skills(driver, wait)
-
-                    if yoe < job_text['yoe']:
-                        continue
-
-                    if salary > job_text['salary'][1]:
-                        continue
-
-                    match_percentage = skills_match(job_text['skill'], user_skills)
-                    if match_percentage < min_match_score * 100:
-                        st.write(f"Checkpoint: Skipping {job_url}: Only {match_percentage:.2f}% user skills matched.")
-                        continue
-                    try:
-                        apply_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Apply')]")))
-                        apply_btn.click()
-                        st.write("Checkpoint: Clicked Apply button.")
-                        current_url = driver.current_url
-                        if expected_domain not in current_url:
-                            st.write(f"Checkpoint: Redirected externally from {job_url}. Skipping application.")
-                            driver.back()
-                            continue
-                        try:
-                            submit_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Submit')]")))
-                            submit_btn.click()
-                            st.write(f"Checkpoint: Successfully applied to {job_url}")
-                        except Exception:
-                            st.write(f"Checkpoint: Quick applied to {job_url}")
-                        applied += 1
-                        try:
-                            limit_msg = driver.find_element(By.XPATH, "//*[contains(text(), 'daily quota')]")
-                            st.write(f"Checkpoint: Daily quota reached message detected: {limit_msg.text}")
-                            break
-                        except NoSuchElementException:
-                            pass
-                    except Exception as e:
-                        st.write(f"Checkpoint: Failed to apply to {job_url}: {str(e)}")
-                        failed.append(job_url)
-                st.write(f"Checkpoint: Applied to {applied} jobs.")
-                return applied, failed
-
-            def extract_skills_from_resume():
-                prompt = "Extract technical skills from this resume:"
-                response = model.generate_content([st.session_state.pdf_text, prompt])
-                return [skill.lower() for skill in response.text.split(", ")]
-
-            def main(job_type, designations, locations, max_applications, yoe, max_pages, min_match_score, salary):
-                credentials = {}
-                credentials['email'] = st.session_state.get('username')
-                credentials['password'] = st.session_state.get('password')
-                
-                user_skills = extract_skills_from_resume()
-                expected_domain = "naukri.com"
-                
-                options = webdriver.ChromeOptions()
-                options.add_argument("--disable-blink-features=AutomationControlled")
-                options.add_argument("--start-maximized")
-                options.add_argument("--window-size=1920,1080")          # Ensure proper viewport size
-                options.add_argument("--disable-gpu")                    # Disable GPU acceleration
-                # For testing, you might comment out headless; later you can enable it:
-                options.add_argument("--headless")  # Enable headless mode for deployment
-                options.add_argument("--no-sandbox")
-                # Commenting out --disable-dev-shm-usage to prevent unexpected exit:
-                # options.add_argument("--disable-dev-shm-usage")
-                driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-                wait = WebDriverWait(driver, 20)
-                
-                try:
-                    login_naukri(driver, wait, credentials)
-                    job_links = scrape_job_links(driver, wait, designations, locations, job_type, max_pages)
-                    st.write(f"Checkpoint: Total job links found: {len(job_links)}")
-                    if job_links:
-                        applied_count, failed_applications = apply_to_jobs(driver, wait, job_links, max_applications, yoe, salary, user_skills, min_match_score, expected_domain)
-                        st.write(f"Checkpoint: Applied to {applied_count} jobs. Failed: {len(failed_applications)}")
-                    else:
-                        st.write("Checkpoint: No job links found. Check search parameters.")
-                finally:
-                    driver.quit()
-                    st.write("Checkpoint: WebDriver session ended.")
-
-            st.info("Auto apply process started. Check the checkpoints below for progress updates.")
-            main(job_type, designations, locations, max_applications, yoe, max_pages, min_match_score, salary)
-            st.success("Auto apply process completed.")
+        totals = {}
+        by_day = {}
+        for day, outcome, count in daily_counts:
+            totals[outcome] = totals.get(outcome, 0) + count
+            by_day.setdefault(outcome, {})[day] = count
+        columns = st.columns(4)
+        for column, outcome in zip(columns, ('applied', 'rejected', 'external', 'failed')):
+            column.metric(outcome.replace('_', ' ').title(), totals.get(outcome, 0))
+
+        st.markdown("### Jobs per Day")
+        st.bar_chart(by_day)
+
+        st.markdown("### Skills Match Distribution")
+        st.bar_chart({'jobs': {f"{bucket}-{bucket + APPLICATION_SCORE_BUCKET}%": count
+                               for bucket, count in get_match_score_distribution(user_email, days)}})
+
+        st.markdown("### Rejection and Failure Reasons")
+        reasons = get_application_reasons(user_email, days=days)
+        st.dataframe([{'outcome': outcome, 'reason': reason or 'unknown', 'jobs': count}
+                      for outcome, reason, count in reasons],
+                     hide_index=True, use_container_width=True)
+
+        st.markdown("### Recent Jobs")
+        outcome_filter = st.selectbox("Outcome", ["all", "applied", "rejected", "external", "failed", "already_applied"])
+        st.dataframe(get_applications(user_email, limit=100, outcome=None if outcome_filter == "all" else outcome_filter),
+                     hide_index=True, use_container_width=True)
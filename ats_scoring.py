@@ -0,0 +1,124 @@
+import re
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+SECTIONS = ('experience', 'education', 'skills')
+ACTION_VERBS = ('achieved', 'implemented', 'developed', 'managed', 'created', 'increased')
+
+NON_ASCII_PATTERN = re.compile(r'[^\x00-\x7F]')
+MULTI_SPACE_PATTERN = re.compile(r'[^\S\n]{2,}')
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+class TokenizedText:
+    """A text tokenized once: lowercase form, term frequencies and formatting flags."""
+
+    __slots__ = ('text', 'lower', 'term_counts', 'word_count', 'ascii_only', 'clean_spacing')
+
+    def __init__(self, text):
+        self.text = text
+        self.lower = text.lower()
+        self.term_counts = Counter(WORD_PATTERN.findall(self.lower))
+        self.word_count = len(text.split())
+        self.ascii_only = NON_ASCII_PATTERN.search(text) is None
+        self.clean_spacing = MULTI_SPACE_PATTERN.search(text) is None
+
+    @property
+    def terms(self):
+        return self.term_counts.keys()
+
+@lru_cache(maxsize=256)
+def tokenize(text):
+    """Return the cached TokenizedText for text."""
+    return TokenizedText(text)
+
+class ATSScoreComponents:
+    def __init__(self):
+        self.format_score = 0
+        self.content_score = 0
+        self.keyword_score = 0
+        self.match_score = 0
+        self.total_score = 0
+
+def normalize_score(score):
+    """Normalize score to prevent outliers"""
+    return np.clip(score, 0, 100) if isinstance(score, np.ndarray) else min(max(score, 0), 100)
+
+def phrase_matrix(docs, phrases):
+    """Boolean (documents x phrases) matrix of case-insensitive substring presence."""
+    phrases = [phrase.lower() for phrase in phrases]
+    return np.array([[phrase in doc.lower for phrase in phrases] for doc in docs], dtype=bool).reshape(len(docs), len(phrases))
+
+def calculate_keyword_match(text, keywords):
+    """Calculate keyword match percentage"""
+    if not keywords:
+        return 0
+    return float(phrase_matrix([tokenize(text)], keywords).mean() * 100)
+
+def term_overlap_matrix(resume_docs, jd_docs):
+    """
+    Fraction of each job description's distinct terms found in each resume,
+    as a (resumes x job descriptions) matrix computed with one matrix product.
+    """
+    vocabulary = {}
+    for doc in jd_docs:
+        for term in doc.terms:
+            vocabulary.setdefault(term, len(vocabulary))
+    jd_matrix = np.zeros((len(jd_docs), len(vocabulary)), dtype=np.float32)
+    for row, doc in enumerate(jd_docs):
+        jd_matrix[row, [vocabulary[term] for term in doc.terms]] = 1
+    resume_matrix = np.zeros((len(resume_docs), len(vocabulary)), dtype=np.float32)
+    for row, doc in enumerate(resume_docs):
+        columns = [vocabulary[term] for term in doc.terms if term in vocabulary]
+        resume_matrix[row, columns] = 1
+    jd_sizes = jd_matrix.sum(axis=1)
+    overlap = resume_matrix @ jd_matrix.T
+    return np.divide(overlap, jd_sizes, out=np.zeros_like(overlap), where=jd_sizes > 0)
+
+def score_batch(resume_texts, job_descriptions=None):
+    """
+    Score many resumes against many job descriptions in one call.
+    Returns a dict of arrays: format_score and keyword_score per resume, and
+    match_score, content_score and total_score per (resume, job description).
+    Without job descriptions the pair arrays have a single column.
+    """
+    resume_docs = [tokenize(text) for text in resume_texts]
+
+    # Basic Resume Structure (40 points)
+    format_score = phrase_matrix(resume_docs, SECTIONS).sum(axis=1) * 10.0
+    format_score += np.array([doc.ascii_only for doc in resume_docs]) * 5.0
+    format_score += np.array([doc.clean_spacing for doc in resume_docs]) * 5.0
+
+    # Content Quality
+    keyword_score = phrase_matrix(resume_docs, ACTION_VERBS).mean(axis=1) * 100
+    base_content = (keyword_score * 0.2)[:, None]
+
+    # Job description matching
+    if job_descriptions:
+        jd_docs = [tokenize(text) for text in job_descriptions]
+        match_score = term_overlap_matrix(resume_docs, jd_docs) * 30
+        content_score = base_content + match_score
+    else:
+        match_score = np.zeros((len(resume_docs), 1))
+        length_bonus = np.array([30.0 if doc.word_count > 200 else 15.0 for doc in resume_docs])
+        content_score = base_content + length_bonus[:, None]
+
+    return {
+        'format_score': format_score,
+        'keyword_score': keyword_score,
+        'match_score': match_score,
+        'content_score': content_score,
+        'total_score': normalize_score(format_score[:, None] + content_score),
+    }
+
+def calculate_base_ats_score(pdf_text, job_description=None):
+    """Calculate unified ATS score and return components"""
+    scores = score_batch([pdf_text], [job_description] if job_description else None)
+    score_components = ATSScoreComponents()
+    score_components.format_score = float(scores['format_score'][0])
+    score_components.keyword_score = float(scores['keyword_score'][0])
+    score_components.match_score = float(scores['match_score'][0, 0])
+    score_components.content_score = float(scores['content_score'][0, 0])
+    score_components.total_score = float(scores['total_score'][0, 0])
+    return score_components
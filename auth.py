@@ -0,0 +1,86 @@
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from database import verify_user
+
+# Password checks run here, at most this many at once (each scrypt hash holds 16 MiB)
+AUTH_WORKERS = min(4, os.cpu_count() or 1)
+# Successful email/password checks are remembered this long, so repeated submits skip the hash
+AUTH_VERIFY_CACHE_TTL = 60
+# A session token stays valid this long after its last use
+AUTH_SESSION_TTL = 30 * 60
+
+_executor = None
+_executor_lock = threading.Lock()
+_lock = threading.Lock()
+# Keyed by an HMAC of email and password under a per-process key, so no password is kept in memory
+_cache_key = secrets.token_bytes(32)
+_verified = {}
+_sessions = {}
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="auth")
+        return _executor
+
+def _verify_key(email, password):
+    return hmac.new(_cache_key, f"{email}\0{password}".encode(), hashlib.sha256).digest()
+
+def _verify(email, password):
+    key = _verify_key(email, password)
+    now = time.monotonic()
+    with _lock:
+        if _verified.get(key, 0) > now:
+            return True
+    if not verify_user(email, password):
+        return False
+    with _lock:
+        _verified[key] = now + AUTH_VERIFY_CACHE_TTL
+    return True
+
+def verify_async(email, password):
+    """Check the email and password on the auth worker pool; returns a Future of a bool."""
+    return _get_executor().submit(_verify, email, password)
+
+def login(email, password):
+    """Verify off the calling thread and return a new session token, or None when the check fails."""
+    evict_expired()
+    if not verify_async(email, password).result():
+        return None
+    token = secrets.token_urlsafe(32)
+    with _lock:
+        _sessions[token] = (email, time.monotonic() + AUTH_SESSION_TTL)
+    return token
+
+def session_user(token):
+    """Return the email of a live session token and extend it, or None when it is unknown or expired."""
+    if not token:
+        return None
+    now = time.monotonic()
+    with _lock:
+        session = _sessions.get(token)
+        if session is None or session[1] <= now:
+            _sessions.pop(token, None)
+            return None
+        _sessions[token] = (session[0], now + AUTH_SESSION_TTL)
+        return session[0]
+
+def logout(token):
+    with _lock:
+        _sessions.pop(token, None)
+
+def evict_expired():
+    """Drop expired session tokens and verification results."""
+    now = time.monotonic()
+    with _lock:
+        for key in [key for key, expires in _verified.items() if expires <= now]:
+            del _verified[key]
+        for token in [token for token, (_, expires) in _sessions.items() if expires <= now]:
+            del _sessions[token]
@@ -0,0 +1,1265 @@
+import streamlit as st
+import heapq
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from webdriver_manager.chrome import ChromeDriverManager
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import instrumentation
+from adaptive_wait import get_adaptive_waits
+from skill_matching import match_percentage
+from database import (
+    JOB_DONE_STATUSES, index_job_links, get_indexed_jobs, update_job_status, log_application,
+    reserve_application, release_application, exhaust_daily_quota, get_remaining_applications
+)
+
+NAUKRI_BASE_URL = "https://www.naukri.com"
+NAUKRI_LOGIN_URL = "https://login.naukri.com/"
+SEARCH_POOL_SIZE = 3
+SEARCH_MIN_HOST_INTERVAL = 1.0
+DETAIL_FETCHERS = 2
+PIPELINE_QUEUE_SIZE = 20
+# How often a fetcher rechecks the daily budget while queued jobs could use it all up
+PIPELINE_QUOTA_POLL = 0.5
+# How often the applying thread checks for cancellation while it waits for qualifying jobs
+PIPELINE_APPLY_POLL = 1.0
+# Ranked applying: scan the qualifying jobs first, then apply to the best scoring ones first
+RANKED_APPLY = True
+RANK_WEIGHTS = {'skills': 0.55, 'yoe': 0.15, 'salary': 0.15, 'recency': 0.15}
+# Experience surplus (years) and posting age (days) at which those parts of the score reach 0
+RANK_YOE_SPAN = 10
+RANK_RECENCY_DAYS = 30
+# Ranked jobs kept beyond max_applications, to replace applications that fail or go off-site
+RANK_SPARE_JOBS = 5
+# Scanning stops once every kept job scores at least this
+RANK_EARLY_STOP_SCORE = 0.8
+POSTED_PATTERN = re.compile(r'Posted:?\s*(?:(\d+)\+?\s*days?\s+ago|just now|today|few hours ago|\d+\s*hours?\s+ago)',
+                            re.IGNORECASE)
+SNAPSHOT_PARSING = True
+ADAPTIVE_WAITS = True
+BROWSER_CACHE_DIR = 'browser_cache'
+BROWSER_CACHE_SIZE = 200 * 1024 * 1024
+DEFAULT_RESOURCE_PROFILE = os.getenv('BROWSER_RESOURCE_PROFILE', 'lean')
+
+# Requests the scrapers never need: they only read text nodes and click buttons
+ASSET_URL_PATTERNS = (
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp', '*.avif',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.m4a', '*.ogg',
+)
+TRACKER_URL_PATTERNS = (
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*googleadservices.com*', '*adservice.google.*', '*connect.facebook.net*', '*facebook.com/tr*',
+    '*hotjar.com*', '*clarity.ms*', '*bat.bing.com*', '*px.ads.linkedin.com*', '*snap.licdn.com*',
+    '*criteo.com*', '*taboola.com*', '*outbrain.com*', '*scorecardresearch.com*', '*newrelic.com*',
+    '*nr-data.net*', '*sentry.io*', '*moengage.com*', '*clevertap*',
+)
+
+# Chrome resource profiles: "default" loads every asset, "lean" blocks images,
+# media, fonts and trackers, returns from driver.get at DOMContentLoaded and
+# shares one disk cache between drivers
+RESOURCE_PROFILES = {
+    'default': {
+        'page_load_strategy': 'normal',
+        'images': True,
+        'blocked_urls': (),
+        'disk_cache': False,
+    },
+    'lean': {
+        'page_load_strategy': 'eager',
+        'images': False,
+        'blocked_urls': ASSET_URL_PATTERNS + TRACKER_URL_PATTERNS,
+        'disk_cache': True,
+    },
+}
+
+# CSS selectors for the job cards on a search results page
+SEARCH_CARD_SELECTORS = {
+    'card': "div.srp-jobtuple-wrapper, article.jobTuple",
+    'title': "a.title",
+    'company': "a.comp-name, a.subTitle",
+    'yoe': "span.expwdth, li.experience span",
+    'salary': "span.sal span, span.sal, li.salary span",
+    'location': "span.locWdth, li.location span",
+    'tags': "ul.tags-gt li, ul.tags li",
+}
+
+# CSS selectors for the fields read from a job detail page
+JOB_DETAIL_SELECTORS = {
+    'skill': "div.styles_key-skill_GIPn",
+    'company_name': "div.styles_jd-header-comp-name__MvqAI",
+    'designation': "h1.styles_jd-header-title__rZwM1",
+    'yoe': "div.styles_jhc_exp_k_giM",
+    'salary': "div.styles_jhc_salary_jdfEC",
+}
+
+_progress_listener = None
+_verbose = False
+_cancel_event = threading.Event()
+
+def set_progress_listener(listener):
+    """
+    Also send checkpoints and progress counters to listener(message, fields),
+    from every thread. Used by background runs, which have no page to write to.
+    """
+    global _progress_listener
+    _progress_listener = listener
+
+def set_verbose(verbose):
+    """Also report the per-page and per-job checkpoints, not only the run-level ones."""
+    global _verbose
+    _verbose = verbose
+
+def checkpoint(message, verbose=False):
+    """
+    Write a progress checkpoint; skipped on worker threads that have no page to write to.
+    Every checkpoint goes to the instrumentation log; verbose (per-page or per-job)
+    ones reach the listener and the page only after set_verbose(True).
+    """
+    instrumentation.event(message)
+    if verbose and not _verbose:
+        return
+    if _progress_listener is not None:
+        _progress_listener(message, None)
+    if get_script_run_ctx(suppress_warning=True) is not None:
+        st.write(f"Checkpoint: {message}")
+
+def report_progress(**fields):
+    """Pass progress counters such as applied=3 to the progress listener, if any."""
+    if _progress_listener is not None:
+        _progress_listener(None, fields)
+
+def request_cancel():
+    """Ask the run in this process to stop at its next search page or job."""
+    _cancel_event.set()
+
+def reset_cancel():
+    _cancel_event.clear()
+
+def cancel_requested():
+    return _cancel_event.is_set()
+
+_driver_path_lock = threading.Lock()
+_driver_path = None
+
+def get_chromedriver_path():
+    """Resolve the chromedriver binary once per process instead of on every run."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None or not os.path.exists(_driver_path):
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+def create_driver(driver_path=None, profile_dir=None, resource_profile=None):
+    """
+    Start a headless Chrome configured for Naukri scraping. With profile_dir,
+    Chrome keeps its cookies and cache in that directory between runs.
+    resource_profile names an entry of RESOURCE_PROFILES (DEFAULT_RESOURCE_PROFILE if not given).
+    """
+    resources = RESOURCE_PROFILES[resource_profile or DEFAULT_RESOURCE_PROFILE]
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = resources['page_load_strategy']
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--start-maximized")
+    options.add_argument("--window-size=1920,1080")          # Ensure proper viewport size
+    options.add_argument("--disable-gpu")                    # Disable GPU acceleration
+    # For testing, you might comment out headless; later you can enable it:
+    options.add_argument("--headless")  # Enable headless mode for deployment
+    options.add_argument("--no-sandbox")
+    # Commenting out --disable-dev-shm-usage to prevent unexpected exit:
+    # options.add_argument("--disable-dev-shm-usage")
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+    if not resources['images']:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if resources['disk_cache']:
+        options.add_argument(f"--disk-cache-dir={os.path.abspath(BROWSER_CACHE_DIR)}")
+        options.add_argument(f"--disk-cache-size={BROWSER_CACHE_SIZE}")
+    driver_path = driver_path or get_chromedriver_path()
+    driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    if resources['blocked_urls']:
+        # Blocked in the network stack, so the requests are never sent
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(resources['blocked_urls'])})
+    return driver
+
+@instrumentation.timed("login")
+def login_naukri(driver, wait, credentials):
+    """Log into Naukri.com using provided credentials. Returns True on success."""
+    driver.get(NAUKRI_LOGIN_URL)
+    checkpoint("Navigated to login page.", verbose=True)
+    try:
+        wait.until(EC.presence_of_element_located((By.ID, 'usernameField'))).send_keys(credentials['email'])
+        wait.until(EC.presence_of_element_located((By.ID, 'passwordField'))).send_keys(credentials['password'])
+        wait.until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Login']"))).click()
+        checkpoint("Login successful.")
+        return True
+    except Exception as e:
+        checkpoint(f"Login failed: {e}")
+        return False
+
+def wait_for(driver, wait, key, condition, default_timeout=None):
+    """
+    wait.until(condition), but with the deadline learned for the selector key
+    when ADAPTIVE_WAITS is on. default_timeout replaces the wait's own timeout.
+    """
+    if default_timeout is None:
+        default_timeout = wait._timeout
+    if not ADAPTIVE_WAITS:
+        return WebDriverWait(driver, default_timeout).until(condition)
+    return get_adaptive_waits().until(driver, key, condition, default_timeout)
+
+@contextmanager
+def logged_in_browser(credentials, driver_path=None, browser_pool=None):
+    """
+    Yield (driver, wait) logged into Naukri, or (None, None) if the login failed.
+    With browser_pool the browser is borrowed from the pool and handed back
+    afterwards; otherwise a fresh driver is started and quit at the end.
+    """
+    if browser_pool is not None:
+        with browser_pool.session(credentials) as session:
+            yield session
+        return
+    driver = create_driver(driver_path)
+    try:
+        wait = WebDriverWait(driver, 20)
+        yield (driver, wait) if login_naukri(driver, wait, credentials) else (None, None)
+    finally:
+        driver.quit()
+
+def construct_url_for_combo(designation, location, job_type, page):
+    """Helper function to generate a URL for a single designation, location, and page."""
+    base_url = NAUKRI_BASE_URL
+    designation_slug = designation.lower().replace(' ', '-')
+    location_slug = location.lower().replace(' ', '-') if location else ""
+    
+    if job_type == "internship":
+        if location_slug:
+            url = (f"{base_url}/{designation_slug}-internship-jobs-in-{location_slug}"
+                if page == 1 else
+                f"{base_url}/internship/{designation_slug}-internship-jobs-in-{location_slug}-{page}")
+        else:
+            url = (f"{base_url}/{designation_slug}-internship-jobs"
+                if page == 1 else
+                f"{base_url}/internship/{designation_slug}-internship-jobs-{page}")
+    else:
+        if location_slug:
+            url = (f"{base_url}/{designation_slug}-jobs-in-{location_slug}"
+                if page == 1 else
+                f"{base_url}/{designation_slug}-jobs-in-{location_slug}-{page}")
+        else:
+            url = (f"{base_url}/{designation_slug}-jobs"
+                if page == 1 else
+                f"{base_url}/{designation_slug}-jobs-{page}")
+    return url
+
+@instrumentation.timed("url_construction")
+def construct_search_url_groups(designations, locations, job_type, max_pages):
+    """
+    For each combination of designation and location (both are lists of strings),
+    generate the list of Naukri search URLs for pages 1 to max_pages.
+    """
+    groups = []
+    
+    for designation in designations:
+        for location in (locations or [""]):
+            urls = []
+            for page in range(1, max_pages + 1):
+                url = construct_url_for_combo(designation, location, job_type, page)
+                checkpoint(f"Constructed URL: {url}", verbose=True)
+                urls.append(url)
+            groups.append(urls)
+                
+    return groups
+
+def construct_search_urls(designations, locations, job_type, max_pages):
+    """
+    For each combination of designation and location (both are lists of strings),
+    and for each page up to max_pages, generate a Naukri search URL.
+    """
+    groups = construct_search_url_groups(designations, locations, job_type, max_pages)
+    return [url for urls in groups for url in urls]
+
+def job_id_from_url(job_url):
+    """Return the numeric Naukri job ID at the end of a job URL, or the URL without its query string."""
+    path = urlparse(job_url).path.rstrip('/')
+    match = re.search(r'-(\d{6,})$', path)
+    return match.group(1) if match else job_url.split('?')[0]
+
+def index_search_page(user_email, page_links, run_job_ids):
+    """
+    Add a search page's jobs to the user's job index. Returns True when every job
+    on the page was handled (opened and given a status) before this run, so later
+    pages can be skipped. Jobs still only 'seen' keep the paging going: an earlier
+    run may have stopped at max_applications before reaching them or the pages after.
+    """
+    jobs = {job_id_from_url(job_url): job_url for job_url in page_links if job_url}
+    if not jobs:
+        return False
+    known = get_indexed_jobs(user_email, jobs.keys())
+    new_jobs = [(job_id, job_url) for job_id, job_url in jobs.items() if job_id not in known]
+    index_job_links(user_email, new_jobs)
+    seen_this_run = any(job_id in run_job_ids for job_id in jobs)
+    run_job_ids.update(job_id for job_id, _ in new_jobs)
+    all_handled = all(job_id in known and known[job_id]['status'] != 'seen' for job_id in jobs)
+    return all_handled and not seen_this_run
+
+@instrumentation.timed("search_page_parse")
+def parse_search_page(html, page_url):
+    """
+    Parse the job cards of a saved search results page into records with the
+    listing-level metadata: url, title, company, yoe, salary, location and tags.
+    Fields missing from a card are None (tags an empty list).
+    """
+    soup = BeautifulSoup(html, "lxml")
+    cards = []
+    containers = soup.select(SEARCH_CARD_SELECTORS['card'])
+    if not containers:
+        # Unknown card markup: fall back to bare links without metadata
+        containers = [link.parent for link in soup.select(SEARCH_CARD_SELECTORS['title'])]
+    for container in containers:
+        title_link = container.select_one(SEARCH_CARD_SELECTORS['title'])
+        if title_link is None or not title_link.get('href'):
+            continue
+        card = {
+            'url': urljoin(page_url, title_link['href']),
+            'title': title_link.get_text(" ", strip=True),
+            'company': None,
+            'yoe': None,
+            'salary': None,
+            'location': None,
+            'tags': [tag.get_text(" ", strip=True).lower()
+                     for tag in container.select(SEARCH_CARD_SELECTORS['tags']) if tag.get_text(strip=True)]
+        }
+        company = container.select_one(SEARCH_CARD_SELECTORS['company'])
+        if company is not None:
+            card['company'] = company.get_text(" ", strip=True)
+        location = container.select_one(SEARCH_CARD_SELECTORS['location'])
+        if location is not None:
+            card['location'] = location.get_text(" ", strip=True)
+        experience = container.select_one(SEARCH_CARD_SELECTORS['yoe'])
+        if experience is not None:
+            years = re.findall(r'\d+', experience.get_text(" ", strip=True))
+            card['yoe'] = int(years[0]) if years else None
+        salary = container.select_one(SEARCH_CARD_SELECTORS['salary'])
+        if salary is not None:
+            # Same rule as the detail page: an unparseable salary ("Not disclosed") counts as [0, 0]
+            try:
+                card['salary'] = list(map(float, salary.get_text(" ", strip=True).split()[0].split('-')))
+            except Exception:
+                card['salary'] = [0, 0]
+        cards.append(card)
+    return cards
+
+@instrumentation.timed("card_filter")
+def card_qualifies(card, yoe, salary, user_skills, min_match_score):
+    """
+    Apply the experience, salary and skill filters to a search card before its
+    detail page is opened. Fields the card doesn't show never reject it.
+    Returns (qualifies, reason).
+    """
+    if card['yoe'] is not None and yoe < card['yoe']:
+        return False, "experience"
+    if card['salary'] is not None and salary > card['salary'][-1]:
+        return False, "salary"
+    if card['tags'] and user_skills and match_percentage(card['tags'], user_skills) < min_match_score * 100:
+        return False, "skills"
+    return True, "qualified"
+
+def scrape_search_page(driver, wait, url):
+    """Load one search results page and return its parsed job cards."""
+    with instrumentation.span("search_page_load"):
+        driver.get(url)
+    checkpoint(f"Navigated to search results: {url}", verbose=True)
+    
+    with instrumentation.span("popup_dismissal"):
+        try:
+            wait_for(driver, wait, 'search.popup_close',
+                     EC.element_to_be_clickable((By.CSS_SELECTOR, "span[title='Close']"))).click()
+            checkpoint("Closed a popup.", verbose=True)
+        except Exception:
+            pass
+    
+    try:
+        with instrumentation.span("search_results_wait"):
+            wait_for(driver, wait, 'search.results',
+                     EC.presence_of_all_elements_located((By.CSS_SELECTOR, SEARCH_CARD_SELECTORS['title'])))
+    except TimeoutException:
+        return []
+    return parse_search_page(driver.page_source, driver.current_url)
+
+def collect_cards(page_cards, job_links, seen, listing_filters=None):
+    """
+    Add the links of new cards that pass listing_filters (keyword arguments for
+    card_qualifies) to job_links. Returns the number of cards filtered out.
+    """
+    rejected = 0
+    for card in page_cards:
+        if card['url'] in seen:
+            continue
+        seen.add(card['url'])
+        if listing_filters and not card_qualifies(card, **listing_filters)[0]:
+            rejected += 1
+            continue
+        job_links.append(card['url'])
+    return rejected
+
+def scrape_job_links(driver, wait, designations, locations, job_type, max_pages, user_email=None,
+                     listing_filters=None):
+    """
+    Collect job links from search results for each designation and location combination.
+    With user_email, found jobs go into the job index and a combination stops paging
+    once a page only lists jobs indexed in earlier runs. With listing_filters, jobs
+    whose cards already fail the yoe/salary/skill filters are left out.
+    """
+    job_links = []
+    seen = set()
+    rejected = 0
+    run_job_ids = set()
+    
+    for urls in construct_search_url_groups(designations, locations, job_type, max_pages):
+        if cancel_requested():
+            break
+        for url in urls:
+            if cancel_requested():
+                checkpoint("Run cancelled, stopping the search.")
+                break
+            page_cards = scrape_search_page(driver, wait, url)
+            rejected += collect_cards(page_cards, job_links, seen, listing_filters)
+            if page_cards:
+                checkpoint(f"Found {len(page_cards)} jobs on {url}", verbose=True)
+            else:
+                checkpoint(f"No jobs found on {url}", verbose=True)
+            if user_email and index_search_page(user_email, [card['url'] for card in page_cards], run_job_ids):
+                checkpoint(f"Only already indexed jobs on {url}, skipping later pages.", verbose=True)
+                break
+    
+    if listing_filters:
+        checkpoint(f"Filtered out {rejected} jobs from their search cards.")
+    checkpoint(f"Total unique job links collected: {len(job_links)}")
+    return job_links
+
+class HostRateLimiter:
+    """Space out requests to the same host by at least min_interval seconds across threads."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+def scrape_job_links_parallel(credentials, designations, locations, job_type, max_pages,
+                              pool_size=SEARCH_POOL_SIZE, max_concurrency=None,
+                              min_host_interval=SEARCH_MIN_HOST_INTERVAL, driver_path=None,
+                              user_email=None, listing_filters=None, browser_pool=None):
+    """
+    Collect job links with a pool of headless drivers, each logged in once.
+    Search pages are shared out through a queue, at most max_concurrency pages
+    load at the same time and requests to a host are spaced by min_host_interval.
+    Links are merged in search URL order without duplicates. With user_email,
+    pages of a combination still queued once it returned only indexed jobs are skipped.
+    Browsers come from browser_pool when given.
+    """
+    groups = construct_search_url_groups(designations, locations, job_type, max_pages)
+    urls = [url for group_urls in groups for url in group_urls]
+    if not urls:
+        return []
+    pool_size = max(1, min(pool_size, len(urls)))
+    driver_path = driver_path or get_chromedriver_path()
+    
+    url_queue = queue.Queue()
+    index = 0
+    for group, group_urls in enumerate(groups):
+        for url in group_urls:
+            url_queue.put((index, group, url))
+            index += 1
+    results = [None] * len(urls)
+    page_slots = threading.BoundedSemaphore(max_concurrency or pool_size)
+    rate_limiter = HostRateLimiter(min_host_interval)
+    index_lock = threading.Lock()
+    run_job_ids = set()
+    exhausted_groups = set()
+
+    def worker():
+        with logged_in_browser(credentials, driver_path, browser_pool) as (driver, wait):
+            if driver is None:
+                return False
+            while True:
+                try:
+                    index, group, url = url_queue.get_nowait()
+                except queue.Empty:
+                    return True
+                if group in exhausted_groups or cancel_requested():
+                    results[index] = False
+                    continue
+                rate_limiter.wait(url)
+                with page_slots:
+                    try:
+                        results[index] = scrape_search_page(driver, wait, url)
+                    except Exception:
+                        results[index] = []
+                if user_email:
+                    page_links = [card['url'] for card in results[index]]
+                    with index_lock:
+                        if index_search_page(user_email, page_links, run_job_ids):
+                            exhausted_groups.add(group)
+
+    with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        futures = [executor.submit(worker) for _ in range(pool_size)]
+        logged_in = 0
+        for future in as_completed(futures):
+            try:
+                logged_in += 1 if future.result() else 0
+            except Exception as e:
+                checkpoint(f"Search worker failed: {e}")
+    checkpoint(f"{logged_in} of {pool_size} search browsers logged in.")
+
+    job_links = []
+    seen = set()
+    rejected = 0
+    for url, page_cards in zip(urls, results):
+        if page_cards is None:
+            checkpoint(f"Skipped {url}: no logged-in browser available", verbose=True)
+            continue
+        if page_cards is False:
+            if not cancel_requested():
+                checkpoint(f"Skipped {url}: earlier page only listed already indexed jobs", verbose=True)
+            continue
+        if page_cards:
+            checkpoint(f"Found {len(page_cards)} jobs on {url}", verbose=True)
+        else:
+            checkpoint(f"No jobs found on {url}", verbose=True)
+        rejected += collect_cards(page_cards, job_links, seen, listing_filters)
+    
+    if listing_filters:
+        checkpoint(f"Filtered out {rejected} jobs from their search cards.")
+    checkpoint(f"Total unique job links collected: {len(job_links)}")
+    return job_links
+
+def extract_job_skills(driver, wait):
+    """
+    Attempt to locate and extract the 'Key Skills' from the job listing.
+    """
+    info = {
+        'skill': [],
+        'yoe': 0,
+        'salary': [],
+        'company_name': "Unknown Company",
+        'designation': "Unknown Designation",
+        'posted_days': None
+    }
+    skill_texts = []
+    
+    with instrumentation.span("detail_field.skill"):
+        try:
+            parent_div = wait_for(driver, wait, 'detail.skill', EC.presence_of_element_located(
+                (By.CSS_SELECTOR, JOB_DETAIL_SELECTORS['skill'])
+            ))
+            child_div = parent_div.find_element(By.XPATH, ".//div[not(@class)]")
+            skill_spans = child_div.find_elements(By.TAG_NAME, "span")
+            for span in skill_spans:
+                text = span.text.strip().lower()
+                if text:
+                    skill_texts.append(text)
+            if skill_texts:
+                checkpoint(f"Found {len(skill_texts)} skills from primary structure.", verbose=True)
+                info['skill'] = skill_texts
+        except Exception as e:
+            info['skill'] = skill_texts
+
+    with instrumentation.span("detail_field.company_name"):
+        try:
+            company_div = wait_for(driver, wait, 'detail.company_name',
+                EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, JOB_DETAIL_SELECTORS['company_name'])
+                ), default_timeout=10
+            )
+            try:
+                company_name = company_div.find_element(By.TAG_NAME, "a").text.strip()
+            except Exception as e:
+                company_name = company_div.text.strip()
+            info['company_name'] = company_name
+        except Exception as e:
+            info['company_name'] = "Unknown Company"
+
+    with instrumentation.span("detail_field.designation"):
+        try:
+            designation_elem = wait_for(driver, wait, 'detail.designation',
+                EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, JOB_DETAIL_SELECTORS['designation'])
+                ), default_timeout=10
+            )
+            designation = designation_elem.text.strip()
+            info['designation'] = designation
+        except Exception as e:
+            info['designation'] = "Unknown Designation"
+
+    with instrumentation.span("detail_field.yoe"):
+        try:
+            exp_div = wait_for(driver, wait, 'detail.yoe',
+                EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, JOB_DETAIL_SELECTORS['yoe'])
+                ), default_timeout=10
+            )
+            try:
+                yoe_text = exp_div.find_element(By.TAG_NAME, "span").text.strip()
+                info['yoe'] = int(yoe_text.split()[0])
+            except Exception as e:
+                try:
+                    info['yoe'] = int(exp_div.text.strip().split()[0])
+                except Exception as e:
+                    info['yoe'] = 0
+        except Exception as e:
+            info['yoe'] = 0
+
+    with instrumentation.span("detail_field.salary"):
+        try:
+            salary_div = wait_for(driver, wait, 'detail.salary',
+                EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, JOB_DETAIL_SELECTORS['salary'])
+                ), default_timeout=10
+            )
+            try:
+                salary_text = salary_div.find_element(By.TAG_NAME, "span").text.strip()
+                info['salary'] = list(map(float, salary_text.split()[0].split('-')))
+            except Exception as e:
+                try:
+                    info['salary'] = list(map(float, salary_div.text.strip().split()[0].split('-')))
+                except Exception as e:
+                    info['salary'] = [0, 0]
+        except Exception as e:
+            info['salary'] = [0, 0]
+
+    with instrumentation.span("detail_field.posted_days"):
+        try:
+            # The page is loaded by now, so no wait; the posting date is optional
+            posted = driver.find_element(By.XPATH, "//*[contains(text(), 'Posted')]/..")
+            info['posted_days'] = parse_posted_days(posted.text)
+        except NoSuchElementException:
+            pass
+
+    return info
+
+@instrumentation.timed("detail_parse")
+def parse_job_page(html):
+    """
+    Parse the job detail fields out of a saved page source, without a browser.
+    Falls back to the same defaults as extract_job_skills for missing fields.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    info = {
+        'skill': [],
+        'yoe': 0,
+        'salary': [0, 0],
+        'company_name': "Unknown Company",
+        'designation': "Unknown Designation",
+        'posted_days': None
+    }
+
+    skill_div = soup.select_one(JOB_DETAIL_SELECTORS['skill'])
+    if skill_div is not None:
+        child_div = skill_div.select_one("div:not([class])")
+        if child_div is not None:
+            spans = (span.get_text(strip=True).lower() for span in child_div.find_all("span"))
+            info['skill'] = [text for text in spans if text]
+
+    company_div = soup.select_one(JOB_DETAIL_SELECTORS['company_name'])
+    if company_div is not None:
+        company_link = company_div.find("a")
+        info['company_name'] = (company_link or company_div).get_text(" ", strip=True)
+
+    designation_elem = soup.select_one(JOB_DETAIL_SELECTORS['designation'])
+    if designation_elem is not None:
+        info['designation'] = designation_elem.get_text(" ", strip=True)
+
+    exp_div = soup.select_one(JOB_DETAIL_SELECTORS['yoe'])
+    if exp_div is not None:
+        for elem in (exp_div.find("span"), exp_div):
+            try:
+                info['yoe'] = int(elem.get_text(" ", strip=True).split()[0])
+                break
+            except Exception:
+                continue
+
+    salary_div = soup.select_one(JOB_DETAIL_SELECTORS['salary'])
+    if salary_div is not None:
+        for elem in (salary_div.find("span"), salary_div):
+            try:
+                info['salary'] = list(map(float, elem.get_text(" ", strip=True).split()[0].split('-')))
+                break
+            except Exception:
+                continue
+
+    posted_label = soup.find(string=re.compile(r'Posted', re.IGNORECASE))
+    if posted_label is not None:
+        # The label and its value are siblings, so read them from the enclosing element
+        container = posted_label.parent.parent or posted_label.parent
+        info['posted_days'] = parse_posted_days(container.get_text(" ", strip=True))
+
+    return info
+
+def wait_for_job_page(driver, wait):
+    """Wait until any job detail field has rendered, or the wait times out."""
+    with instrumentation.span("detail_wait"):
+        try:
+            wait_for(driver, wait, 'detail.any', EC.presence_of_element_located(
+                (By.CSS_SELECTOR, ", ".join(JOB_DETAIL_SELECTORS.values()))
+            ))
+        except TimeoutException:
+            pass
+
+def extract_job_skills_snapshot(driver, wait, page_ready=False):
+    """
+    Wait once for any job detail field to render, then parse every field from
+    driver.page_source. A missing field costs nothing extra instead of a 10s timeout.
+    page_ready skips the wait when the caller already waited for the page.
+    """
+    if not page_ready:
+        wait_for_job_page(driver, wait)
+    info = parse_job_page(driver.page_source)
+    if info['skill']:
+        checkpoint(f"Found {len(info['skill'])} skills from primary structure.", verbose=True)
+    return info
+
+def skills_match(job_skills, user_skills):
+    """
+    Calculate the percentage of the job's skills covered by the user's skills,
+    using canonical names and vector similarity so spelling variants still match.
+    Returns the match percentage.
+    """
+    if not job_skills:
+        return 0
+    with instrumentation.span("skill_match"):
+        percentage = match_percentage(job_skills, user_skills)
+    checkpoint(f"{percentage:.2f}% of user skills matched.", verbose=True)
+    return percentage
+
+def is_already_applied(driver):
+    """Check whether the loaded job page shows the 'Applied' marker."""
+    try:
+        driver.find_element(By.XPATH, "//div[contains(text(), 'Applied')]")
+        return True
+    except NoSuchElementException:
+        return False
+
+def fetch_job_details(driver, wait, job_url, snapshot=SNAPSHOT_PARSING):
+    """Open a job posting and return a record with its parsed details."""
+    with instrumentation.span("detail_page_load"):
+        driver.get(job_url)
+    # With the eager page load strategy driver.get returns before the page has rendered
+    wait_for_job_page(driver, wait)
+    record = {'url': job_url, 'already_applied': is_already_applied(driver), 'info': None}
+    if not record['already_applied']:
+        if snapshot:
+            record['info'] = extract_job_skills_snapshot(driver, wait, page_ready=True)
+        else:
+            record['info'] = extract_job_skills(driver, wait)
+    return record
+
+def evaluate_job(info, yoe, salary, user_skills, min_match_score):
+    """
+    Decide whether a job qualifies for an application.
+    Returns (qualifies, reason, match_percentage).
+    """
+    if yoe < info['yoe']:
+        return False, "experience", 0
+    # A single figure ("12 Lacs") parses to a one-element range; an unreadable salary counts as 0
+    if salary > (info['salary'][-1] if info['salary'] else 0):
+        return False, "salary", 0
+    match_percentage = skills_match(info['skill'], user_skills)
+    if match_percentage < min_match_score * 100:
+        return False, "skills", match_percentage
+    return True, "qualified", match_percentage
+
+def skip_known_jobs(job_links, user_email, yoe, salary, user_skills, min_match_score):
+    """
+    Drop jobs the index marks as handled in earlier runs, and rejected jobs whose
+    stored info still fails the current filters, so they need no page load.
+    """
+    job_ids = {job_url: job_id_from_url(job_url) for job_url in job_links}
+    indexed = get_indexed_jobs(user_email, set(job_ids.values()))
+    remaining = []
+    for job_url in job_links:
+        entry = indexed.get(job_ids[job_url])
+        if entry is not None:
+            if entry['status'] in JOB_DONE_STATUSES:
+                continue
+            if entry['status'] == 'rejected' and entry['info'] and \
+                    not evaluate_job(entry['info'], yoe, salary, user_skills, min_match_score)[0]:
+                continue
+        remaining.append(job_url)
+    checkpoint(f"Skipped {len(job_links) - len(remaining)} jobs already handled in earlier runs.")
+    return remaining
+
+def record_job(user_email, record, status, match_score=None, reason=None):
+    """Store a job's extracted info, match score and outcome in the job index and the application log."""
+    if user_email:
+        job_id = job_id_from_url(record['url'])
+        info = record.get('info')
+        update_job_status(user_email, job_id, record['url'], status, info, match_score)
+        log_application(user_email, job_id, record['url'], status, company=info.get('company_name') if info else None,
+                        reason=reason, match_score=match_score)
+
+@instrumentation.timed("apply")
+def apply_to_job(driver, wait, job_url, expected_domain):
+    """
+    Click through the apply flow on the currently loaded job page.
+    Returns (outcome, quota_reached, reason) where outcome is 'applied', 'external'
+    or 'failed' and reason names the exception a failed application hit.
+    """
+    try:
+        with instrumentation.span("apply_click"):
+            apply_btn = wait_for(driver, wait, 'apply.button',
+                                 EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Apply')]")))
+            apply_btn.click()
+        checkpoint("Clicked Apply button.", verbose=True)
+        current_url = driver.current_url
+        if expected_domain not in current_url:
+            checkpoint(f"Redirected externally from {job_url}. Skipping application.", verbose=True)
+            driver.back()
+            return "external", False, None
+        try:
+            submit_btn = wait_for(driver, wait, 'apply.submit',
+                                  EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Submit')]")))
+            submit_btn.click()
+            checkpoint(f"Successfully applied to {job_url}", verbose=True)
+        except Exception:
+            checkpoint(f"Quick applied to {job_url}", verbose=True)
+        try:
+            limit_msg = driver.find_element(By.XPATH, "//*[contains(text(), 'daily quota')]")
+            checkpoint(f"Daily quota reached message detected: {limit_msg.text}")
+            return "applied", True, None
+        except NoSuchElementException:
+            return "applied", False, None
+    except Exception as e:
+        checkpoint(f"Failed to apply to {job_url}: {str(e)}")
+        return "failed", False, type(e).__name__
+
+class DailyQuota:
+    """
+    A user's application budget for today in the quota ledger, shared by all
+    their runs. An application is reserved before the Apply click and given
+    back if it doesn't go through, so concurrent runs never exceed daily_limit.
+    """
+
+    def __init__(self, user_email, daily_limit):
+        self.user_email = user_email
+        self.daily_limit = daily_limit
+
+    def remaining(self):
+        return get_remaining_applications(self.user_email, self.daily_limit)
+
+    def reserve(self):
+        """Returns the ledger day the application was counted on, or None when the budget is used up."""
+        return reserve_application(self.user_email, self.daily_limit)
+
+    def settle(self, day, outcome, quota_reached):
+        if outcome != "applied":
+            release_application(self.user_email, day)
+        if quota_reached:
+            exhaust_daily_quota(self.user_email)
+
+def apply_within_quota(driver, wait, job_url, expected_domain, quota):
+    """
+    apply_to_job counted against quota (if any). Returns apply_to_job's
+    (outcome, quota_reached, reason), or (None, True, None) when the daily budget
+    was used up, e.g. by another run, before the click.
+    """
+    if quota is None:
+        return apply_to_job(driver, wait, job_url, expected_domain)
+    day = quota.reserve()
+    if day is None:
+        checkpoint("Daily application quota used up.")
+        return None, True, None
+    outcome, quota_reached = None, False
+    try:
+        outcome, quota_reached, reason = apply_to_job(driver, wait, job_url, expected_domain)
+    finally:
+        quota.settle(day, outcome, quota_reached)
+    return outcome, quota_reached, reason
+
+def parse_posted_days(text):
+    """Days since posting from text like 'Posted: 3 days ago', 0 for 'Just now' or 'Today', else None."""
+    match = POSTED_PATTERN.search(text or "")
+    if match is None:
+        return None
+    return int(match.group(1)) if match.group(1) else 0
+
+def score_job(info, yoe, salary, match_percentage):
+    """
+    Rank score in [0, 1] of a qualifying job, weighted by RANK_WEIGHTS: skill
+    match, how close the required experience is to the user's, how far the
+    offered salary is above the expected one and how recently it was posted.
+    Unknown salary and posting dates count as average.
+    """
+    yoe_fit = max(0.0, 1 - (yoe - info['yoe']) / RANK_YOE_SPAN)
+    offered = info['salary'][-1] if info['salary'] else 0
+    salary_fit = min(1.0, (offered - salary) / offered) if offered > 0 else 0.5
+    posted_days = info.get('posted_days')
+    recency = max(0.0, 1 - posted_days / RANK_RECENCY_DAYS) if posted_days is not None else 0.5
+    return (RANK_WEIGHTS['skills'] * match_percentage / 100 + RANK_WEIGHTS['yoe'] * yoe_fit +
+            RANK_WEIGHTS['salary'] * salary_fit + RANK_WEIGHTS['recency'] * recency)
+
+class TopJobs:
+    """
+    Bounded min-heap of the k best-scoring qualifying jobs seen so far. Once
+    it holds k jobs that all score at least RANK_EARLY_STOP_SCORE, `enough` is
+    true and the rest of the job links need not be scanned.
+    """
+
+    def __init__(self, k):
+        self.k = max(1, k)
+        self._heap = []
+        self._seen = 0
+
+    def push(self, record, score):
+        # The counter breaks ties in scrape order and keeps records out of the comparison
+        entry = (score, -self._seen, record)
+        self._seen += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    @property
+    def enough(self):
+        return len(self._heap) >= self.k and self._heap[0][0] >= RANK_EARLY_STOP_SCORE
+
+    def best_first(self):
+        return [record for _, _, record in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+def rank_jobs(records, max_applications, yoe, salary):
+    """
+    Consume qualifying job records and return the best max_applications +
+    RANK_SPARE_JOBS of them, best first. Stops pulling records early once
+    enough high-scoring jobs are known.
+    """
+    top = TopJobs(max_applications + RANK_SPARE_JOBS)
+    scanned = 0
+    for record in records:
+        scanned += 1
+        top.push(record, score_job(record['info'], yoe, salary, record['match']))
+        if top.enough:
+            checkpoint(f"Found {top.k} jobs scoring {RANK_EARLY_STOP_SCORE:.0%} or more, not scanning further.")
+            break
+    ranked = top.best_first()
+    checkpoint(f"Ranked {scanned} qualifying jobs, applying to the best {len(ranked)} first.")
+    return ranked
+
+def qualifying_jobs(driver, wait, job_links, yoe, salary, user_skills, min_match_score, user_email=None, quota=None):
+    """
+    Open each job in turn and yield the records of those that qualify, with
+    their skill match in record['match']. Already applied and rejected jobs are
+    recorded here. Stops on cancellation or once today's quota is used up.
+    """
+    for job_url in job_links:
+        if cancel_requested():
+            checkpoint("Run cancelled, no more applications.")
+            return
+        if quota is not None and quota.remaining() <= 0:
+            checkpoint("Daily application quota used up, not checking more jobs today.")
+            return
+        record = fetch_job_details(driver, wait, job_url)
+        checkpoint(f"Navigated to job posting: {job_url}", verbose=True)
+        if record['already_applied']:
+            checkpoint(f"Already applied to {job_url}", verbose=True)
+            record_job(user_email, record, 'already_applied')
+            continue
+
+        qualifies, reason, match_percentage = evaluate_job(record['info'], yoe, salary, user_skills, min_match_score)
+        if not qualifies:
+            if reason == "skills":
+                checkpoint(f"Skipping {job_url}: Only {match_percentage:.2f}% user skills matched.", verbose=True)
+            record_job(user_email, record, 'rejected', match_percentage, reason)
+            continue
+        record['match'] = match_percentage
+        yield record
+
+def apply_to_jobs(driver, wait, job_links, max_applications, yoe, salary, user_skills, min_match_score, expected_domain,
+                  user_email=None, quota=None, rank=False):
+    """
+    Apply to jobs after checking the skills match and update the application log in the DB.
+    With a DailyQuota, stops before loading another job once today's budget is used up.
+    With rank, scans the jobs first and applies to the highest scoring ones first
+    (see rank_jobs), instead of applying in scrape order.
+    """
+    applied = 0
+    failed = []
+    if user_email:
+        job_links = skip_known_jobs(job_links, user_email, yoe, salary, user_skills, min_match_score)
+    candidates = qualifying_jobs(driver, wait, job_links, yoe, salary, user_skills, min_match_score, user_email, quota)
+    if rank:
+        candidates = rank_jobs(candidates, max_applications, yoe, salary)
+    for record in candidates:
+        if cancel_requested():
+            checkpoint("Run cancelled, no more applications.")
+            break
+        job_url = record['url']
+        if rank:
+            # Scanning moved the browser on to other jobs
+            driver.get(job_url)
+            checkpoint(f"Applying to {job_url} ({record['match']:.2f}% skills matched)", verbose=True)
+        outcome, quota_reached, reason = apply_within_quota(driver, wait, job_url, expected_domain, quota)
+        if outcome is None:
+            break
+        record_job(user_email, record, outcome, record['match'], reason)
+        if outcome == "applied":
+            applied += 1
+        elif outcome == "failed":
+            failed.append(job_url)
+        report_progress(applied=applied, failed=len(failed))
+        if quota_reached:
+            break
+        if applied >= max_applications:
+            checkpoint("Reached daily application limit.")
+            break
+    checkpoint(f"Applied to {applied} jobs.")
+    return applied, failed
+
+def run_apply_pipeline(driver, wait, credentials, job_links, max_applications, yoe, salary, user_skills,
+                       min_match_score, expected_domain, fetchers=DETAIL_FETCHERS, driver_path=None, user_email=None,
+                       browser_pool=None, quota=None, rank=False):
+    """
+    Staged version of apply_to_jobs. A pool of logged-in fetcher browsers opens
+    job pages and parses their details into a queue, a filter stage keeps the
+    jobs that qualify, and the calling thread applies to those with its own
+    driver. Page loads for rejected jobs overlap instead of blocking applications.
+    With a DailyQuota, fetchers stop loading pages once the jobs already queued
+    for applying would use up today's budget. With rank, the filter stage ranks
+    the qualifying jobs (see rank_jobs) and applying starts once scanning ends.
+    Returns (applied, failed) like apply_to_jobs.
+    """
+    if user_email:
+        job_links = skip_known_jobs(job_links, user_email, yoe, salary, user_skills, min_match_score)
+    if not job_links:
+        return 0, []
+    fetchers = max(1, min(fetchers, len(job_links)))
+    driver_path = driver_path or get_chromedriver_path()
+
+    url_queue = queue.Queue()
+    for job_url in job_links:
+        url_queue.put(job_url)
+    record_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    apply_queue = queue.Queue()
+    stop = threading.Event()
+    # Set once ranking has seen enough good jobs, so fetchers stop opening new pages
+    enough = threading.Event()
+    done = object()
+    fetchers_done = 0
+    filter_errors = []
+
+    def budget_left():
+        """Wait while the queued jobs could use up today's budget; False once it is gone."""
+        while quota is not None and not stop.is_set():
+            remaining = quota.remaining()
+            if remaining <= 0:
+                return False
+            if remaining > apply_queue.qsize():
+                return True
+            time.sleep(PIPELINE_QUOTA_POLL)
+        return not stop.is_set()
+
+    def fetch_worker():
+        try:
+            with logged_in_browser(credentials, driver_path, browser_pool) as (fetch_driver, fetch_wait):
+                while fetch_driver is not None and not stop.is_set() and not enough.is_set() and \
+                        not cancel_requested() and budget_left():
+                    try:
+                        job_url = url_queue.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        record = fetch_job_details(fetch_driver, fetch_wait, job_url)
+                    except Exception:
+                        record = {'url': job_url, 'already_applied': False, 'info': None}
+                    record_queue.put(record)
+        except Exception:
+            pass
+        finally:
+            record_queue.put(done)
+
+    def qualifying_records():
+        """Yield the fetched records that qualify until every fetcher is done, recording the rest."""
+        nonlocal fetchers_done
+        while fetchers_done < fetchers:
+            record = record_queue.get()
+            if record is done:
+                fetchers_done += 1
+                continue
+            if record['already_applied']:
+                record_job(user_email, record, 'already_applied')
+                continue
+            if record['info'] is None or stop.is_set():
+                continue
+            qualifies, reason, match_percentage = evaluate_job(record['info'], yoe, salary, user_skills, min_match_score)
+            if qualifies:
+                record['match'] = match_percentage
+                yield record
+            else:
+                record_job(user_email, record, 'rejected', match_percentage, reason)
+
+    def filter_worker():
+        nonlocal fetchers_done
+        records = qualifying_records()
+        try:
+            if rank:
+                ranked = rank_jobs(records, max_applications, yoe, salary)
+                enough.set()
+                # Evaluate the pages fetchers were still loading, recording the rejected ones
+                for _ in records:
+                    pass
+                records = ranked
+            for record in records:
+                apply_queue.put(record)
+        except Exception as e:
+            filter_errors.append(e)
+        finally:
+            # Even after an error: stop the fetchers and take what they still hand over,
+            # so none of them blocks on the full queue, then release the applying thread
+            enough.set()
+            while fetchers_done < fetchers:
+                if record_queue.get() is done:
+                    fetchers_done += 1
+            apply_queue.put(done)
+
+    threads = [threading.Thread(target=fetch_worker, daemon=True) for _ in range(fetchers)]
+    threads.append(threading.Thread(target=filter_worker, daemon=True))
+    for thread in threads:
+        thread.start()
+
+    applied = 0
+    failed = []
+    try:
+        while True:
+            try:
+                record = apply_queue.get(timeout=PIPELINE_APPLY_POLL)
+            except queue.Empty:
+                if cancel_requested():
+                    checkpoint("Run cancelled, no more applications.")
+                    break
+                continue
+            if record is done:
+                break
+            if applied >= max_applications:
+                checkpoint("Reached daily application limit.")
+                break
+            if cancel_requested():
+                checkpoint("Run cancelled, no more applications.")
+                break
+            job_url = record['url']
+            driver.get(job_url)
+            checkpoint(f"Applying to {job_url} ({record['match']:.2f}% skills matched)", verbose=True)
+            outcome, quota_reached, reason = apply_within_quota(driver, wait, job_url, expected_domain, quota)
+            if outcome is None:
+                break
+            record_job(user_email, record, outcome, record['match'], reason)
+            if outcome == "applied":
+                applied += 1
+            elif outcome == "failed":
+                failed.append(job_url)
+            report_progress(applied=applied, failed=len(failed))
+            if quota_reached:
+                break
+    finally:
+        # The filter stage keeps draining the record queue, so fetchers finish their current page and exit
+        stop.set()
+        for thread in threads:
+            thread.join()
+    if filter_errors:
+        raise filter_errors[0]
+    checkpoint(f"Applied to {applied} jobs.")
+    return applied, failed
+
+def run_auto_apply(credentials, params, browser_pool, state=None, save_state=None):
+    """
+    Run one Auto Apply job end to end with browsers from browser_pool: search,
+    filter and apply. params holds the form values and the resume's user_skills.
+    state is the checkpoint of an earlier attempt of the same run; save_state(state)
+    is called once the job links are collected, so a resumed run goes straight to
+    applying and the job index skips jobs it already handled. params['max_applications']
+    is the user's daily budget in the quota ledger, shared with their other runs.
+    Returns {'links', 'applied', 'failed', 'cancelled'} for this attempt.
+    """
+    state = dict(state or {})
+    user_skills = params['user_skills']
+    user_email = credentials['email']
+    result = {'links': 0, 'applied': 0, 'failed': [], 'cancelled': False}
+    quota = DailyQuota(user_email, params['max_applications'])
+    if quota.remaining() <= 0:
+        checkpoint("Today's application quota is used up. Not searching until tomorrow.")
+        return result
+
+    with browser_pool.session(credentials) as (driver, wait):
+        if driver is None:
+            raise RuntimeError("Login failed.")
+        job_links = state.get('job_links')
+        if job_links is None:
+            report_progress(stage="searching")
+            listing_filters = {'yoe': params['yoe'], 'salary': params['salary'], 'user_skills': user_skills,
+                               'min_match_score': params['min_match_score']}
+            if params['search_browsers'] > 1:
+                job_links = scrape_job_links_parallel(credentials, params['designations'], params['locations'],
+                                                      params['job_type'], params['max_pages'],
+                                                      pool_size=params['search_browsers'], user_email=user_email,
+                                                      listing_filters=listing_filters, browser_pool=browser_pool)
+            else:
+                job_links = scrape_job_links(driver, wait, params['designations'], params['locations'],
+                                             params['job_type'], params['max_pages'],
+                                             user_email=user_email, listing_filters=listing_filters)
+            if cancel_requested():
+                result['cancelled'] = True
+                return result
+            state['job_links'] = job_links
+            if save_state:
+                save_state(state)
+        else:
+            checkpoint(f"Resuming with {len(job_links)} job links from the last checkpoint.")
+        result['links'] = len(job_links)
+        report_progress(stage="applying", links=len(job_links))
+        checkpoint(f"Total job links found: {len(job_links)}")
+
+        # The ledger already counts what earlier attempts of this run and other runs applied to today
+        max_applications = quota.remaining()
+        if job_links and max_applications > 0:
+            args = (job_links, max_applications, params['yoe'], params['salary'], user_skills,
+                    params['min_match_score'], "naukri.com")
+            rank = params.get('rank_jobs', RANKED_APPLY)
+            if params['detail_browsers'] > 0:
+                applied, failed = run_apply_pipeline(driver, wait, credentials, *args, fetchers=params['detail_browsers'],
+                                                     user_email=user_email, browser_pool=browser_pool, quota=quota,
+                                                     rank=rank)
+            else:
+                applied, failed = apply_to_jobs(driver, wait, *args, user_email=user_email, quota=quota, rank=rank)
+            result['applied'] = applied
+            result['failed'] = failed
+        elif not job_links:
+            checkpoint("No job links found. Check search parameters.")
+        else:
+            checkpoint("Today's application quota is used up.")
+    result['cancelled'] = cancel_requested()
+    return result
@@ -0,0 +1,170 @@
+import csv
+import io
+import os
+import zipfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from pdf_utils import PDF_POOL_WORKERS, read_pdf_pages, get_process_pool
+from ats_scoring import score_batch
+from cache import make_cache_key, get_cached_analysis, cache_analysis
+
+# Files read into memory at once; the shared PDF pool (PDF_POOL_WORKERS) sets how many are extracted in parallel
+BATCH_IN_FLIGHT = 2 * PDF_POOL_WORKERS
+BATCH_TOP_K = 5
+# What reading one resume can raise: unreadable files, and corrupt, encrypted or unsupported zip members
+READ_ERRORS = (OSError, EOFError, RuntimeError, NotImplementedError, zipfile.BadZipFile, zlib.error)
+
+SCREENING_PROMPT = """
+You are an expert technical recruiter. In at most 6 bullet points, assess how well
+this resume fits the job description: strongest matching qualifications, missing
+must-have skills, and an overall recommendation (Strong fit / Possible fit / Weak fit).
+
+Job Description: {job_description}
+"""
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _raise(error):
+    raise error
+
+def _unique_name(name, used):
+    # Uploads and zip members can share a file name; number the repeats so results stay apart
+    stem, extension = os.path.splitext(name)
+    unique, copy = name, 1
+    while unique in used:
+        copy += 1
+        unique = f"{stem} ({copy}){extension}"
+    used.add(unique)
+    return unique
+
+def resume_sources(uploaded_files=None, directory=None, zip_file=None):
+    """
+    Return (name, read) pairs for every PDF in the given uploads, directory or
+    zip archive. read() loads one file's bytes on demand, so files are only held
+    in memory while they are being extracted. An archive that can't be opened
+    becomes a single source whose read() raises, so it is reported like any
+    unreadable resume. Names are unique: a repeated one is numbered, like "cv (2).pdf".
+    """
+    sources = []
+    used = set()
+    for uploaded_file in uploaded_files or []:
+        sources.append((_unique_name(uploaded_file.name, used), uploaded_file.getvalue))
+    if directory:
+        for root, _, files in os.walk(directory):
+            for filename in sorted(files):
+                if filename.lower().endswith('.pdf'):
+                    path = os.path.join(root, filename)
+                    sources.append((_unique_name(os.path.relpath(path, directory), used),
+                                    lambda path=path: _read_file(path)))
+    if zip_file is not None:
+        try:
+            archive = zipfile.ZipFile(zip_file)
+        except READ_ERRORS as e:
+            sources.append((getattr(zip_file, 'name', "archive.zip"), lambda e=e: _raise(e)))
+            return sources
+        for member in archive.infolist():
+            if not member.is_dir() and member.filename.lower().endswith('.pdf'):
+                sources.append((_unique_name(member.filename, used), lambda member=member: archive.read(member)))
+    return sources
+
+def _extract_text(data):
+    return "".join(read_pdf_pages(data, use_disk_cache=False, parallel=False))
+
+def extract_resume_texts(sources, max_in_flight=BATCH_IN_FLIGHT):
+    """
+    Extract text from (name, read) sources with the shared PDF process pool,
+    yielding (name, text, error) as files finish. At most max_in_flight files
+    are read into memory at once.
+    """
+    source_iter = iter(sources)
+    pending = {}
+    read_errors = []
+    executor = get_process_pool()
+    try:
+        def fill():
+            while len(pending) < max_in_flight:
+                try:
+                    name, read = next(source_iter)
+                except StopIteration:
+                    return
+                try:
+                    pending[executor.submit(_extract_text, read())] = name
+                except READ_ERRORS as e:
+                    read_errors.append((name, "", str(e) or type(e).__name__))
+
+        fill()
+        while pending or read_errors:
+            while read_errors:
+                yield read_errors.pop(0)
+            if pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = pending.pop(future)
+                    try:
+                        yield name, future.result(), None
+                    except Exception as e:
+                        yield name, "", str(e)
+            fill()
+    finally:
+        # The pool is shared, so drop this batch's queued files when the page stops reading early
+        for future in pending:
+            future.cancel()
+
+def rank_resumes(resumes, job_description):
+    """
+    Score (name, text) pairs against the job description with the local ATS
+    scorer and return rows sorted best first.
+    """
+    names = [name for name, _ in resumes]
+    texts = [text for _, text in resumes]
+    if not texts:
+        return []
+    scores = score_batch(texts, [job_description])
+    rows = []
+    for i, name in enumerate(names):
+        rows.append({
+            'resume': name,
+            'ats_score': round(float(scores['total_score'][i, 0]), 1),
+            'jd_match': round(float(scores['match_score'][i, 0]) / 30 * 100, 1),
+            'format_score': round(float(scores['format_score'][i]), 1),
+            'keyword_score': round(float(scores['keyword_score'][i]), 1),
+            'words': len(texts[i].split()),
+        })
+    rows.sort(key=lambda row: row['ats_score'], reverse=True)
+    for rank, row in enumerate(rows, start=1):
+        row['rank'] = rank
+    return rows
+
+def analyze_top_candidates(client, rows, texts, job_description, top_k=BATCH_TOP_K):
+    """
+    Send the top_k ranked resumes to Gemini in one concurrent batch, reusing
+    cached analyses. Returns {resume name: analysis text}.
+    """
+    prompt = SCREENING_PROMPT.format(job_description=job_description)
+    analyses = {}
+    to_request = []
+    for row in rows[:top_k]:
+        name = row['resume']
+        cache_key = make_cache_key(texts[name], job_description, "Batch Screening", client.model_name, prompt)
+        cached = get_cached_analysis(cache_key)
+        if cached:
+            analyses[name] = cached
+        else:
+            to_request.append((name, cache_key))
+    responses = client.generate_many([[texts[name], prompt] for name, _ in to_request])
+    for (name, cache_key), response_text in zip(to_request, responses):
+        cache_analysis(cache_key, response_text)
+        analyses[name] = response_text
+    return analyses
+
+def ranking_to_csv(rows):
+    """Serialize ranked rows (including any 'analysis' column) as CSV text."""
+    output = io.StringIO()
+    columns = ['rank', 'resume', 'ats_score', 'jd_match', 'format_score', 'keyword_score', 'words', 'analysis']
+    writer = csv.DictWriter(output, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(rows)
+    return output.getvalue()
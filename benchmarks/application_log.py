@@ -0,0 +1,124 @@
+"""
+Measure the application log: what a log write costs the apply loop and how
+fast the dashboard queries are over millions of rows.
+
+    python -m benchmarks.application_log [--rows 2000000] [--users 200] [--days 365] [--queries 50]
+
+Fills application_log and its daily rollups in a temporary directory, then
+times log_application as the apply loop calls it (a queued write), the same
+row written synchronously, and the dashboard's rollup queries against the
+equivalent aggregates over application_log itself.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+import database
+
+OUTCOMES = (('applied', None), ('rejected', 'skills'), ('rejected', 'experience'), ('rejected', 'salary'),
+            ('external', None), ('already_applied', None), ('failed', 'TimeoutException'),
+            ('failed', 'ElementClickInterceptedException'))
+COMPANIES = tuple(f"Company {i}" for i in range(500))
+SEED_BATCH = 50000
+
+def seed(rows, users, days):
+    rng = random.Random(0)
+    first_day = date.today() - timedelta(days=days - 1)
+    batch = []
+    for i in range(rows):
+        outcome, reason = rng.choice(OUTCOMES)
+        day = (first_day + timedelta(days=rng.randrange(days))).isoformat()
+        batch.append((f"user{rng.randrange(users)}@example.com", str(i), f"https://example.com/job-{i}",
+                      rng.choice(COMPANIES), outcome, reason, rng.uniform(0, 100), day, f"{day} 12:00:00"))
+        if len(batch) == SEED_BATCH:
+            with database.connection() as conn:
+                database._write_applications(conn, batch)
+            batch = []
+    if batch:
+        with database.connection() as conn:
+            database._write_applications(conn, batch)
+
+def timings(func, count):
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def report(name, samples, unit='ms'):
+    scale = 1000 if unit == 'ms' else 1000000
+    p95 = statistics.quantiles(samples, n=20)[-1]
+    print(f"  {name:<34} p50 {statistics.median(samples) * scale:9.3f} {unit}  p95 {p95 * scale:9.3f} {unit}")
+
+def _write_now(user, i, day):
+    with database.connection() as conn:
+        database._write_applications(conn, [(user, f"sync{i}", "https://example.com/sync", "Company 1", 'applied',
+                                             None, 72.0, day, f"{day} 12:00:00")])
+
+def _since(days):
+    return (date.today() - timedelta(days=days - 1)).isoformat()
+
+def _log_daily_counts(user, days):
+    with database.connection() as conn:
+        return conn.execute('''
+            SELECT day, outcome, COUNT(*) FROM application_log WHERE user_email = ? AND day >= ?
+            GROUP BY day, outcome ORDER BY day
+        ''', (user, _since(days))).fetchall()
+
+def _log_score_distribution(user, days):
+    bucket = database.APPLICATION_SCORE_BUCKET
+    with database.connection() as conn:
+        return conn.execute(f'''
+            SELECT MIN(CAST(match_score / {bucket} AS INTEGER) * {bucket}, {100 - bucket}) AS b, COUNT(*)
+            FROM application_log WHERE user_email = ? AND day >= ? AND match_score IS NOT NULL
+            GROUP BY b ORDER BY b
+        ''', (user, _since(days))).fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        database.init_db()
+        start = time.perf_counter()
+        seed(args.rows, args.users, args.days)
+        seconds = time.perf_counter() - start
+        print(f"seeded {args.rows} rows for {args.users} users over {args.days} days "
+              f"in {seconds:.1f}s ({args.rows / seconds:.0f} rows/sec with rollups)")
+        user = "user0@example.com"
+
+        print("write cost seen by the apply loop:")
+        report("log_application (queued)", timings(
+            lambda i: database.log_application(user, f"new{i}", "https://example.com/new", 'applied',
+                                               company="Company 1", match_score=72.0), 1000), unit='us')
+        database.flush_writes()
+        now = date.today().isoformat()
+        report("same row written synchronously", timings(
+            lambda i: _write_now(user, i, now), 200), unit='us')
+
+        print(f"dashboard queries, last 30 days of {user}:")
+        report("daily counts (rollup)", timings(lambda i: database.get_application_daily_counts(user, 30), args.queries))
+        report("daily counts (log scan)", timings(lambda i: _log_daily_counts(user, 30), args.queries))
+        report("reasons (rollup)", timings(lambda i: database.get_application_reasons(user, days=30), args.queries))
+        report("match scores (rollup)", timings(lambda i: database.get_match_score_distribution(user, 30), args.queries))
+        report("match scores (log scan)", timings(lambda i: _log_score_distribution(user, 30), args.queries))
+        report("recent failed jobs (index)", timings(
+            lambda i: database.get_applications(user, limit=100, outcome='failed'), args.queries))
+        report("recent jobs at one company (index)", timings(
+            lambda i: database.get_applications(user, limit=100, company="Company 7"), args.queries))
+        database.get_pool().close()
+        os.chdir(cwd)
+
+if __name__ == '__main__':
+    main()
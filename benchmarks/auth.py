@@ -0,0 +1,116 @@
+"""
+Measure login latency and throughput with a large users table.
+
+    python -m benchmarks.auth [--users 100000] [--logins 200] [--threads 1,4]
+
+Seeds the users table in a temporary directory, then times verify_user for
+existing users with the right password, the wrong password and an unknown
+email, and the old SHA-256 query for comparison. Throughput is measured
+through auth.login with several threads, and a session token check stands
+in for what a Streamlit rerun costs once the user is logged in. Users share
+a few precomputed hashes, since hashing 100k passwords at full cost would
+take longer than the benchmark itself.
+"""
+import argparse
+import hashlib
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+import auth
+import database
+
+DISTINCT_HASHES = 16
+
+def seed_users(count):
+    hashes = [database.hash_password(f"password{i}") for i in range(DISTINCT_HASHES)]
+    with database.connection() as conn:
+        conn.executemany('INSERT INTO users (username, password, email) VALUES (?, ?, ?)',
+                         ((f"user{i}", hashes[i % DISTINCT_HASHES], f"user{i}@example.com") for i in range(count)))
+        # The old scheme, on its own rows, for the baseline query
+        conn.executemany('INSERT INTO users (username, password, email) VALUES (?, ?, ?)',
+                         ((f"legacy{i}", hashlib.sha256(f"password{i}".encode()).hexdigest(), f"legacy{i}@example.com")
+                          for i in range(count)))
+
+def legacy_verify_user(email, password):
+    # verify_user as it was: unsalted SHA-256 compared in SQL, whole row fetched
+    with database.connection() as conn:
+        row = conn.execute('SELECT * FROM users WHERE email = ? AND password = ?',
+                           (email, hashlib.sha256(password.encode()).hexdigest())).fetchone()
+    return row is not None
+
+def latencies(func, logins, users):
+    rng = random.Random(1)
+    samples = []
+    for _ in range(logins):
+        i = rng.randrange(users)
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def report(name, samples):
+    p95 = statistics.quantiles(samples, n=20)[-1]
+    print(f"  {name:<28} p50 {statistics.median(samples) * 1000:9.3f} ms  p95 {p95 * 1000:9.3f} ms")
+
+def throughput(threads, logins, users):
+    """Logins per second through auth.login with threads concurrent sessions."""
+    per_thread = max(1, logins // threads)
+
+    def session(index):
+        rng = random.Random(index)
+        for _ in range(per_thread):
+            i = rng.randrange(users)
+            # A fresh password per attempt, so the verification cache doesn't answer
+            auth.login(f"user{i}@example.com", f"wrong{rng.random()}")
+
+    workers = [threading.Thread(target=session, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--threads', default='1,4,16', help="comma separated concurrent session counts")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        database.init_db()
+        start = time.perf_counter()
+        seed_users(args.users)
+        print(f"seeded {args.users} users in {time.perf_counter() - start:.1f}s "
+              f"(scrypt n={database.PASSWORD_SCRYPT_N} r={database.PASSWORD_SCRYPT_R} p={database.PASSWORD_SCRYPT_P})")
+
+        print("latency per login:")
+        report("old sha256 query", latencies(
+            lambda i: legacy_verify_user(f"legacy{i}@example.com", f"password{i}"), args.logins, args.users))
+        report("scrypt, right password", latencies(
+            lambda i: database.verify_user(f"user{i}@example.com", f"password{i % DISTINCT_HASHES}"),
+            args.logins, args.users))
+        report("scrypt, wrong password", latencies(
+            lambda i: database.verify_user(f"user{i}@example.com", "wrong"), args.logins, args.users))
+        report("scrypt, unknown email", latencies(
+            lambda i: database.verify_user(f"nobody{i}@example.com", "wrong"), args.logins, args.users))
+        token = auth.login("user0@example.com", "password0")
+        report("session token (rerun)", latencies(lambda i: auth.session_user(token), args.logins, args.users))
+        report("cached login (resubmit)", latencies(
+            lambda i: auth.login("user0@example.com", "password0"), args.logins, args.users))
+
+        print(f"throughput through auth.login ({auth.AUTH_WORKERS} auth workers):")
+        for threads in (int(value) for value in args.threads.split(',')):
+            print(f"  {threads:3d} sessions  {throughput(threads, args.logins, args.users):8.1f} logins/sec")
+        database.get_pool().close()
+        os.chdir(cwd)
+
+if __name__ == '__main__':
+    main()
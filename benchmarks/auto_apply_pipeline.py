@@ -0,0 +1,178 @@
+"""
+Benchmark the Auto Apply functions against the offline replay server.
+
+    python -m benchmarks.auto_apply_pipeline [--pages 3] [--mode sequential|pipeline] [--fetchers 2]
+        [--search-browsers 1] [--no-snapshot] [--card-filters] [--wait 20] [--latency 0.0]
+        [--resource-profile lean] [--quota N] [--no-adaptive-waits] [--rank]
+
+Runs the real login_naukri, scrape_job_links(_parallel) and apply_to_jobs /
+run_apply_pipeline code with Chrome against local fixtures, and reports pages
+per second, jobs evaluated per second, time per stage and the time spent in
+waits that ended in a timeout. Learned wait deadlines are kept in
+adaptive_waits.json, so repeated runs show the adaptive waits converging.
+"""
+import argparse
+import threading
+import time
+from collections import defaultdict
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
+
+import auto_apply
+import instrumentation
+from adaptive_wait import get_adaptive_waits
+from auto_apply import RESOURCE_PROFILES
+from benchmarks.replay_server import ReplayServer, SEARCH_PAGES
+
+USER_SKILLS = ['python', 'django', 'sql', 'aws', 'docker', 'rest api', 'git']
+CREDENTIALS = {'email': 'bench@example.com', 'password': 'replay'}
+
+class StageTimer:
+    """Thread-safe totals of call counts and seconds per stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.applied_matches = []
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self.seconds[stage] += seconds
+            self.calls[stage] += 1
+
+    def wrap(self, stage, func, **fixed):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs, **fixed)
+            finally:
+                self.record(stage, time.perf_counter() - start)
+        return timed
+
+def instrument(timer, snapshot):
+    """Time the Auto Apply stages and every wait that times out."""
+    for stage in ('login_naukri', 'scrape_search_page', 'evaluate_job', 'apply_to_job'):
+        setattr(auto_apply, stage, timer.wrap(stage, getattr(auto_apply, stage)))
+    auto_apply.fetch_job_details = timer.wrap('fetch_job_details', auto_apply.fetch_job_details, snapshot=snapshot)
+
+    record_job = auto_apply.record_job
+    def recorded(user_email, record, status, match_score=None, reason=None):
+        if status == 'applied':
+            timer.applied_matches.append(match_score)
+        return record_job(user_email, record, status, match_score, reason)
+    auto_apply.record_job = recorded
+
+    until = WebDriverWait.until
+    def timed_until(self, method, message=""):
+        start = time.perf_counter()
+        try:
+            return until(self, method, message)
+        except TimeoutException:
+            timer.record('timeout_wait', time.perf_counter() - start)
+            raise
+    WebDriverWait.until = timed_until
+
+def run(args):
+    server = ReplayServer(latency=args.latency, quota=args.quota).start()
+    auto_apply.NAUKRI_BASE_URL = server.base_url
+    auto_apply.NAUKRI_LOGIN_URL = f"{server.base_url}/login"
+    auto_apply.DEFAULT_RESOURCE_PROFILE = args.resource_profile
+    auto_apply.ADAPTIVE_WAITS = args.adaptive_waits
+    expected_domain = server.base_url.split('://', 1)[1]
+    timer = StageTimer()
+    instrument(timer, args.snapshot)
+    instrumentation.reset()
+    instrumentation.configure(args.metrics_log, benchmark=args.mode)
+
+    listing_filters = None
+    if args.card_filters:
+        listing_filters = {'yoe': args.yoe, 'salary': 0, 'user_skills': USER_SKILLS, 'min_match_score': args.min_match_score}
+    filters = (args.yoe, 0, USER_SKILLS, args.min_match_score, expected_domain)
+
+    driver = auto_apply.create_driver()
+    wait = WebDriverWait(driver, args.wait)
+    stage_seconds = {}
+    try:
+        start = time.perf_counter()
+        if not auto_apply.login_naukri(driver, wait, CREDENTIALS):
+            raise SystemExit("Login against the replay server failed")
+        stage_seconds['login'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if args.search_browsers > 1:
+            job_links = auto_apply.scrape_job_links_parallel(CREDENTIALS, ["python developer"], ["bangalore"], "job",
+                                                             args.pages, pool_size=args.search_browsers,
+                                                             listing_filters=listing_filters)
+        else:
+            job_links = auto_apply.scrape_job_links(driver, wait, ["python developer"], ["bangalore"], "job",
+                                                    args.pages, listing_filters=listing_filters)
+        stage_seconds['search'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if args.mode == 'pipeline':
+            applied, failed = auto_apply.run_apply_pipeline(driver, wait, CREDENTIALS, job_links, args.max_applications,
+                                                            *filters, fetchers=args.fetchers, rank=args.rank)
+        else:
+            applied, failed = auto_apply.apply_to_jobs(driver, wait, job_links, args.max_applications, *filters,
+                                                       rank=args.rank)
+        stage_seconds['apply'] = time.perf_counter() - start
+    finally:
+        driver.quit()
+        server.stop()
+        instrumentation.configure(None)
+
+    total = sum(stage_seconds.values())
+    pages = server.requests.get('search', 0) + server.requests.get('job', 0)
+    evaluated = timer.calls['evaluate_job']
+    print(f"mode={args.mode} rank={args.rank} fetchers={args.fetchers} search_browsers={args.search_browsers} "
+          f"snapshot={args.snapshot} profile={args.resource_profile} wait={args.wait}s latency={args.latency}s")
+    print(f"job links: {len(job_links)}  applied: {applied}  failed: {len(failed)}  "
+          f"applications seen by server: {server.applications}")
+    if timer.applied_matches:
+        print(f"mean skill match of applied jobs: {sum(timer.applied_matches) / len(timer.applied_matches):.1f}%")
+    print(f"total: {total:.2f}s  pages/sec: {pages / total:.2f} ({pages} pages)  "
+          f"jobs evaluated/sec: {evaluated / total:.2f} ({evaluated} jobs)")
+    for stage, seconds in stage_seconds.items():
+        print(f"  stage {stage:<8} {seconds:8.2f}s")
+    for stage in sorted(timer.seconds):
+        calls = timer.calls[stage]
+        print(f"  {stage:<20} {timer.seconds[stage]:8.2f}s over {calls:4d} calls ({timer.seconds[stage] / calls:.3f}s each)")
+    if args.adaptive_waits:
+        waits = get_adaptive_waits()
+        waits.save()
+        print("adaptive waits:")
+        for row in waits.snapshot():
+            print(f"  {row['selector']:<22} n={row['samples']:<4d} present={row['presence_rate']:.2f}  "
+                  f"p50={row['p50_s']}s  p99={row['p99_s']}s")
+    print("spans:")
+    for row in instrumentation.summary():
+        print(f"  {row['span']:<26} n={row['count']:<5d} total={row['total_s']:8.2f}s  "
+              f"p50={row['p50_s']:.3f}s  p95={row['p95_s']:.3f}s  max={row['max_s']:.3f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=3, help=f"search pages to scrape (fixtures have {SEARCH_PAGES})")
+    parser.add_argument('--mode', choices=('sequential', 'pipeline'), default='sequential')
+    parser.add_argument('--fetchers', type=int, default=auto_apply.DETAIL_FETCHERS)
+    parser.add_argument('--search-browsers', type=int, default=1)
+    parser.add_argument('--no-snapshot', dest='snapshot', action='store_false',
+                        help="read job fields with per-field waits instead of one page_source snapshot")
+    parser.add_argument('--no-adaptive-waits', dest='adaptive_waits', action='store_false',
+                        help="use the fixed timeouts instead of the learned per-selector deadlines")
+    parser.add_argument('--card-filters', action='store_true', help="filter jobs on their search cards first")
+    parser.add_argument('--rank', action='store_true',
+                        help="scan the jobs first and apply to the best scoring ones first (with --max-applications)")
+    parser.add_argument('--wait', type=float, default=20, help="WebDriverWait timeout of the main driver")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the server adds to every response")
+    parser.add_argument('--resource-profile', choices=list(RESOURCE_PROFILES), default=auto_apply.DEFAULT_RESOURCE_PROFILE)
+    parser.add_argument('--quota', type=int, help="server reports the daily quota after this many applications")
+    parser.add_argument('--metrics-log', help="append every span and checkpoint to this JSON lines file")
+    parser.add_argument('--max-applications', type=int, default=1000)
+    parser.add_argument('--yoe', type=int, default=3)
+    parser.add_argument('--min-match-score', type=float, default=0.2)
+    run(parser.parse_args())
+
+if __name__ == '__main__':
+    main()
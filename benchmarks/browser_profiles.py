@@ -0,0 +1,98 @@
+"""
+Compare Chrome resource profiles on real pages: per-page load time, requests
+and bytes transferred, renderer JS heap and total Chrome memory.
+
+    python -m benchmarks.browser_profiles [--runs 3] [--profiles default lean] [url ...]
+
+Without URLs a Naukri search page is loaded. Each profile gets a fresh driver
+with an empty disk cache; the first load of every page is reported separately
+from the warm loads that follow it.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import auto_apply
+from auto_apply import RESOURCE_PROFILES, create_driver, construct_url_for_combo
+
+DEFAULT_URLS = (construct_url_for_combo("python developer", "bangalore", "job", 1),)
+
+def chrome_rss_mb(driver):
+    """Resident memory of chromedriver's Chrome process tree in MB (Linux only, else None)."""
+    root = driver.service.process.pid
+    try:
+        parents = {}
+        for pid in filter(str.isdigit, os.listdir('/proc')):
+            try:
+                with open(f'/proc/{pid}/stat') as f:
+                    parents[int(pid)] = int(f.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+    except OSError:
+        return None
+    tree, frontier = set(), {root}
+    while frontier:
+        tree |= frontier
+        frontier = {pid for pid, parent in parents.items() if parent in frontier} - tree
+    total_kb = 0
+    for pid in tree - {root}:
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                total_kb += next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+        except (OSError, StopIteration):
+            continue
+    return total_kb / 1024
+
+def load_page(driver, url):
+    """Load url and return (seconds, requests, kilobytes transferred, JS heap MB)."""
+    driver.execute_cdp_cmd('Performance.enable', {})
+    start = time.perf_counter()
+    driver.get(url)
+    elapsed = time.perf_counter() - start
+    resources = driver.execute_script(
+        "return performance.getEntriesByType('resource').map(e => e.transferSize || 0)"
+    )
+    metrics = {m['name']: m['value'] for m in driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']}
+    return elapsed, len(resources), sum(resources) / 1024, metrics.get('JSHeapUsedSize', 0) / 1024 / 1024
+
+def benchmark_profile(profile, urls, runs):
+    cache_dir = tempfile.mkdtemp(prefix=f"bench-cache-{profile}-")
+    auto_apply.BROWSER_CACHE_DIR = cache_dir
+    driver = create_driver(resource_profile=profile)
+    try:
+        cold, warm = [], []
+        for url in urls:
+            for run in range(runs):
+                (cold if run == 0 else warm).append(load_page(driver, url))
+        rss = chrome_rss_mb(driver)
+    finally:
+        driver.quit()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return cold, warm, rss
+
+def summarize(samples):
+    if not samples:
+        return "n/a"
+    seconds, requests, kilobytes, heap = zip(*samples)
+    return (f"{statistics.median(seconds):6.2f}s  {statistics.median(requests):5.0f} req  "
+            f"{statistics.median(kilobytes):8.0f} KB  {statistics.median(heap):6.1f} MB heap")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('urls', nargs='*', default=list(DEFAULT_URLS))
+    parser.add_argument('--runs', type=int, default=3, help="loads per URL (the first one is cold)")
+    parser.add_argument('--profiles', nargs='+', default=list(RESOURCE_PROFILES), choices=list(RESOURCE_PROFILES))
+    args = parser.parse_args()
+
+    for profile in args.profiles:
+        cold, warm, rss = benchmark_profile(profile, args.urls, max(1, args.runs))
+        print(f"[{profile}]")
+        print(f"  cold  {summarize(cold)}")
+        print(f"  warm  {summarize(warm)}")
+        print(f"  chrome rss  {rss:.0f} MB" if rss is not None else "  chrome rss  n/a")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Measure logins per second against user_data.db with concurrent sessions.
+
+    python -m benchmarks.db_logins [--sessions 1,8,32] [--seconds 3] [--users 200] [--writers 2]
+
+Each session is a thread calling verify_user for random users in a loop, the
+way Streamlit serves every browser session from its own thread. Compares the
+old connect-per-call access (a new connection, rollback journal, no statement
+reuse) with the pooled WAL connections of database.py. --writers adds threads
+recording job statuses at the same time, as a running Auto Apply job does.
+"pooled WAL sha256" runs the old query through the pool, so it compares the
+data access alone; "pooled WAL scrypt" is database.verify_user with its salted
+scrypt check, which with few CPUs is bound by hashing rather than the database.
+Runs in a temporary directory, so the repository's database is not touched.
+"""
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+import database
+
+# The old access path gets its own file: WAL mode, once set, stays with a database
+LEGACY_DB_PATH = 'legacy_user_data.db'
+
+def legacy_hash_password(password):
+    # The unsalted SHA-256 the old verify_user compared in SQL
+    return hashlib.sha256(password.encode()).hexdigest()
+
+def legacy_verify_user(email, password):
+    # verify_user as it was: one connection per call, default journal mode
+    conn = sqlite3.connect(LEGACY_DB_PATH)
+    c = conn.cursor()
+    c.execute('SELECT * FROM users WHERE email = ? AND password = ?', (email, legacy_hash_password(password)))
+    user = c.fetchone()
+    conn.close()
+    return user
+
+def pooled_legacy_verify_user(email, password):
+    # The old query through the pool, on rows seeded with the old hash, to compare data access alone
+    with database.connection() as conn:
+        row = conn.execute('SELECT * FROM users WHERE email = ? AND password = ?',
+                           (email.replace('user', 'sha', 1), legacy_hash_password(password))).fetchone()
+    return row is not None
+
+def legacy_update_job_status(user_email, job_id, url, status):
+    conn = sqlite3.connect(LEGACY_DB_PATH)
+    conn.execute('''
+        INSERT INTO job_index (user_email, job_id, url, status) VALUES (?, ?, ?, ?)
+        ON CONFLICT (user_email, job_id) DO UPDATE SET status = excluded.status, updated_at = CURRENT_TIMESTAMP
+    ''', (user_email, job_id, url, status))
+    conn.commit()
+    conn.close()
+
+def seed_users(count):
+    database.init_db()
+    conn = sqlite3.connect(LEGACY_DB_PATH)
+    for statements in database.MIGRATIONS:
+        for statement in statements:
+            conn.execute(statement)
+    for i in range(count):
+        database.create_user(f"user{i}", f"password{i}", f"user{i}@example.com")
+        with database.connection() as pooled:
+            pooled.execute('INSERT INTO users (username, password, email) VALUES (?, ?, ?)',
+                           (f"sha{i}", legacy_hash_password(f"password{i}"), f"sha{i}@example.com"))
+        conn.execute('INSERT INTO users (username, password, email) VALUES (?, ?, ?)',
+                     (f"user{i}", legacy_hash_password(f"password{i}"), f"user{i}@example.com"))
+    conn.commit()
+    conn.close()
+
+def measure(verify, update, sessions, writers, seconds, users):
+    """Return (logins/sec, p95 login latency in ms, job status writes/sec)."""
+    stop = threading.Event()
+    latencies = [[] for _ in range(sessions)]
+    writes = [0] * writers
+    errors = []
+
+    def session(index):
+        rng = random.Random(index)
+        while not stop.is_set():
+            i = rng.randrange(users)
+            start = time.perf_counter()
+            try:
+                if not verify(f"user{i}@example.com", f"password{i}"):
+                    errors.append(f"login failed for user{i}")
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+            latencies[index].append(time.perf_counter() - start)
+
+    def writer(index):
+        n = 0
+        while not stop.is_set():
+            try:
+                update(f"user{index}@example.com", f"{index}-{n % 500}", "https://example.com/job", 'seen')
+                writes[index] += 1
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+            n += 1
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    # Queued job statuses only count once they are committed
+    if update is database.update_job_status:
+        database.flush_writes()
+    write_seconds = time.perf_counter() - start
+
+    samples = [latency for session_latencies in latencies for latency in session_latencies]
+    p95 = statistics.quantiles(samples, n=20)[-1] * 1000 if len(samples) > 1 else 0.0
+    if errors:
+        print(f"  {len(errors)} errors, e.g. {errors[0]}")
+    return len(samples) / seconds, p95, sum(writes) / write_seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', default='1,8,32', help="comma separated concurrent session counts")
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--writers', type=int, default=2, help="threads writing job statuses during the logins")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        seed_users(args.users)
+        variants = (
+            ('connect-per-call', legacy_verify_user, legacy_update_job_status),
+            ('pooled WAL sha256', pooled_legacy_verify_user, database.update_job_status),
+            ('pooled WAL scrypt', database.verify_user, database.update_job_status),
+        )
+        print(f"{'variant':<18} {'sessions':>8} {'logins/sec':>11} {'p95 ms':>8} {'writes/sec':>11}")
+        for sessions in (int(value) for value in args.sessions.split(',')):
+            for name, verify, update in variants:
+                logins, p95, writes = measure(verify, update, sessions, args.writers, args.seconds, args.users)
+                print(f"{name:<18} {sessions:>8d} {logins:>11.0f} {p95:>8.2f} {writes:>11.0f}")
+        database.get_pool().close()
+        os.chdir(cwd)
+
+if __name__ == '__main__':
+    main()
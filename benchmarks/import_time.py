@@ -0,0 +1,86 @@
+"""
+Measure what app.py pays for imports and script runs.
+
+    python -m benchmarks.import_time [--runs 5]
+
+Each sample runs in a fresh interpreter, so nothing is already in sys.modules.
+Reports the cold import time of the login page's modules against every
+module app.py used to import up front, then the cold first run and the
+median warm rerun of the login page script. The script runs in Streamlit's
+bare mode, which executes everything but the browser round trip (AppTest's
+polling would hide differences of a few milliseconds).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOGIN_IMPORTS = ('streamlit', 'dotenv', 'database', 'auth', 'cache')
+FEATURE_IMPORTS = {
+    'Resume ATS Pro': ('plotly.graph_objects', 'google.generativeai', 'gemini_client', 'pdf_utils',
+                       'ats_scoring', 'skill_matching', 'skill_profile'),
+    'Batch Screening': ('google.generativeai', 'gemini_client', 'batch_screening'),
+    'Auto Apply': ('google.generativeai', 'gemini_client', 'pdf_utils', 'skill_profile', 'auto_apply', 'job_runner'),
+}
+# Everything app.py imported at the top before features loaded their own dependencies
+EAGER_IMPORTS = LOGIN_IMPORTS + ('numpy', 'plotly.graph_objects', 'google.generativeai', 'gemini_client',
+                                 'pdf_utils', 'ats_scoring', 'batch_screening', 'skill_matching',
+                                 'skill_profile', 'auto_apply', 'job_runner')
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+{imports}
+print(time.perf_counter() - start)
+"""
+
+APP_SNIPPET = """
+import logging, runpy, statistics, time
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+runpy.run_path({app_path!r})
+first = time.perf_counter() - start
+reruns = []
+for _ in range(20):
+    start = time.perf_counter()
+    runpy.run_path({app_path!r})
+    reruns.append(time.perf_counter() - start)
+print(first, statistics.median(reruns))
+"""
+
+def run_sample(code):
+    # Run from an empty directory so app.py creates its databases there, not in the repo
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    with tempfile.TemporaryDirectory() as work_dir:
+        output = subprocess.run([sys.executable, '-c', code], cwd=work_dir, env=env,
+                                capture_output=True, text=True, check=True).stdout
+    values = [float(value) for value in output.split()]
+    return values if len(values) > 1 else values[0]
+
+def import_time(modules, runs):
+    code = IMPORT_SNIPPET.format(imports="\n".join(f"import {module}" for module in modules))
+    return statistics.median(run_sample(code) for _ in range(runs))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    login = import_time(LOGIN_IMPORTS, args.runs)
+    eager = import_time(EAGER_IMPORTS, args.runs)
+    print(f"login page imports      {login * 1000:8.1f} ms")
+    print(f"all eager imports       {eager * 1000:8.1f} ms  (saved on the login page: {(eager - login) * 1000:.1f} ms)")
+    for feature, modules in FEATURE_IMPORTS.items():
+        print(f"  + {feature:<20} {import_time(LOGIN_IMPORTS + modules, args.runs) * 1000:8.1f} ms")
+
+    app_snippet = APP_SNIPPET.format(app_path=os.path.join(REPO_DIR, 'app.py'))
+    samples = [run_sample(app_snippet) for _ in range(args.runs)]
+    print(f"login page first run    {statistics.median(first for first, _ in samples) * 1000:8.1f} ms")
+    print(f"login page rerun        {statistics.median(rerun for _, rerun in samples) * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
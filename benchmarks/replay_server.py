@@ -0,0 +1,267 @@
+"""
+Local stand-in for Naukri that serves search and job detail pages matching
+SEARCH_CARD_SELECTORS and JOB_DETAIL_SELECTORS, so the Auto Apply functions
+can run without the live site.
+
+    python -m benchmarks.replay_server [--port 8765] [--fixtures DIR] [--latency 0.05]
+
+Pages are generated from a fixed seed and cover the awkward cases: job pages
+with missing fields (all of them show a posting date), search pages with and without the close popup, jobs
+already marked "Applied", external apply redirects, quick-apply jobs without
+a Submit step and the daily quota message. A page saved as DIR/<url path>.html
+(e.g. recorded from the live site) is served instead of the generated one.
+"""
+import argparse
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+JOBS_PER_PAGE = 20
+SEARCH_PAGES = 5
+SEED = 7
+
+SKILL_POOL = (
+    'python', 'django', 'flask', 'sql', 'postgresql', 'aws', 'docker', 'kubernetes', 'react', 'javascript',
+    'java', 'spring boot', 'machine learning', 'pandas', 'rest api', 'git', 'linux', 'redis', 'kafka', 'golang',
+)
+COMPANIES = ('Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Tech', 'Hooli')
+TITLES = ('Python Developer', 'Backend Engineer', 'Data Engineer', 'Software Engineer', 'Full Stack Developer')
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><body>
+<input id="usernameField" type="text">
+<input id="passwordField" type="password">
+<button type="button" onclick="document.cookie='session=replay; path=/'; location.href='/mnjuser/homepage'">Login</button>
+</body></html>"""
+
+HOME_PAGE = """<!DOCTYPE html><html><body><h1>Home</h1></body></html>"""
+
+EXTERNAL_PAGE = """<!DOCTYPE html><html><body><h1>Company careers site</h1></body></html>"""
+
+APPLY_SCRIPT = """
+<script>
+function applyToJob(jobId, external, hasForm) {
+  if (external) { location.href = external; return; }
+  fetch('/apply/' + jobId, {method: 'POST'}).then(r => r.json()).then(d => {
+    if (d.quota) {
+      const msg = document.createElement('div');
+      msg.textContent = 'You have reached your daily quota of applications';
+      document.body.appendChild(msg);
+    }
+    if (hasForm) {
+      const submit = document.createElement('button');
+      submit.textContent = 'Submit';
+      submit.onclick = () => submit.remove();
+      document.body.appendChild(submit);
+    }
+  });
+}
+</script>"""
+
+def build_jobs(count=JOBS_PER_PAGE * SEARCH_PAGES, seed=SEED):
+    """Deterministic job fixtures: {job_id: job dict}."""
+    rng = random.Random(seed)
+    jobs = {}
+    for i in range(count):
+        job_id = str(100000000000 + i * 7919)
+        min_yoe = rng.choice((0, 1, 2, 3, 5, 8))
+        min_salary = rng.choice((3, 5, 8, 12, 20))
+        jobs[job_id] = {
+            'id': job_id,
+            'title': rng.choice(TITLES),
+            'company': rng.choice(COMPANIES),
+            'yoe': (min_yoe, min_yoe + rng.choice((2, 3, 5))),
+            'salary': (min_salary, min_salary + rng.choice((2, 4, 8))),
+            'location': rng.choice(('Bangalore', 'Pune', 'Hyderabad', 'Remote')),
+            'skills': rng.sample(SKILL_POOL, rng.randint(4, 9)),
+            'missing': {field for field in ('skill', 'salary', 'yoe', 'company_name')
+                        if rng.random() < 0.08},
+            'applied': rng.random() < 0.1,
+            'external': rng.random() < 0.15,
+            'has_form': rng.random() < 0.4,
+            # Derived from the id rather than rng, so the other fields stay as they were
+            'posted_days': int(job_id) % 31,
+        }
+    return jobs
+
+def job_slug(job):
+    return re.sub(r'[^a-z0-9]+', '-', f"{job['title']} {job['company']} {job['location']}".lower()).strip('-')
+
+def job_path(job):
+    return f"/job-listings-{job_slug(job)}-{job['id']}"
+
+def render_search_page(jobs, page, popup):
+    cards = []
+    for job in jobs:
+        tags = ''.join(f"<li>{html.escape(skill)}</li>" for skill in job['skills'])
+        cards.append(f"""
+<div class="srp-jobtuple-wrapper">
+  <a class="title" href="{job_path(job)}">{html.escape(job['title'])}</a>
+  <a class="comp-name">{html.escape(job['company'])}</a>
+  <span class="expwdth">{job['yoe'][0]}-{job['yoe'][1]} Yrs</span>
+  <span class="sal"><span>{job['salary'][0]}-{job['salary'][1]} Lacs PA</span></span>
+  <span class="locWdth">{html.escape(job['location'])}</span>
+  <ul class="tags-gt">{tags}</ul>
+</div>""")
+    popup_html = ('<div id="popup"><span title="Close" onclick="this.parentNode.remove()">x</span></div>'
+                  if popup else '')
+    return f"<!DOCTYPE html><html><body>{popup_html}<h1>Page {page}</h1>{''.join(cards)}</body></html>"
+
+def render_job_page(job, external_url):
+    missing = job['missing']
+    parts = [f'<h1 class="styles_jd-header-title__rZwM1">{html.escape(job["title"])}</h1>']
+    if 'company_name' not in missing:
+        parts.append(f'<div class="styles_jd-header-comp-name__MvqAI"><a>{html.escape(job["company"])}</a></div>')
+    if 'yoe' not in missing:
+        parts.append(f'<div class="styles_jhc_exp_k_giM"><span>{job["yoe"][0]} - {job["yoe"][1]} Yrs</span></div>')
+    if 'salary' not in missing:
+        parts.append(f'<div class="styles_jhc_salary_jdfEC"><span>{job["salary"][0]}-{job["salary"][1]} Lacs P.A.</span></div>')
+    else:
+        parts.append('<div class="styles_jhc_salary_jdfEC"><span>Not disclosed</span></div>')
+    parts.append(f'<div class="styles_jhc__jd-stats"><span><label>Posted:</label> '
+                 f'<span>{job["posted_days"]} days ago</span></span></div>')
+    if 'skill' not in missing:
+        spans = ''.join(f'<a><span>{html.escape(skill)}</span></a>' for skill in job['skills'])
+        parts.append(f'<div class="styles_key-skill_GIPn"><div class="styles_heading">Key Skills</div><div>{spans}</div></div>')
+    if job['applied']:
+        parts.append('<div>Applied</div>')
+    else:
+        external = json.dumps(external_url if job['external'] else None)
+        parts.append(f"""<button onclick='applyToJob("{job['id']}", {external}, {json.dumps(job['has_form'])})'>Apply</button>""")
+    return f"<!DOCTYPE html><html><body>{''.join(parts)}{APPLY_SCRIPT}</body></html>"
+
+class ReplayServer:
+    """
+    Serves the fixtures on localhost from a background thread. Counts every
+    request by kind and the applications made, and starts adding the quota
+    message once quota applications were made.
+    """
+
+    def __init__(self, port=0, fixtures_dir=None, latency=0.0, quota=None, jobs=None):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.quota = quota
+        self.jobs = jobs or build_jobs()
+        self._job_list = list(self.jobs.values())
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.applications = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def external_url(self):
+        # Same server under another host name, so the apply flow sees a redirect off the site
+        return f"http://localhost:{self._server.server_address[1]}/careers"
+
+    def _count(self, kind):
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+
+    def _recorded(self, path):
+        if not self.fixtures_dir:
+            return None
+        file_path = os.path.join(self.fixtures_dir, path.strip('/').replace('/', os.sep) + '.html')
+        if os.path.isfile(file_path):
+            with open(file_path, encoding='utf-8') as f:
+                return f.read()
+        return None
+
+    def route(self, method, path):
+        """Return (status, content type, body) for a request."""
+        if method == 'POST' and path.startswith('/apply/'):
+            self._count('apply')
+            with self._lock:
+                self.applications += 1
+                quota = self.quota is not None and self.applications >= self.quota
+            return 200, 'application/json', json.dumps({'quota': quota})
+        recorded = self._recorded(path)
+        if recorded is not None:
+            self._count('recorded')
+            return 200, 'text/html', recorded
+        if path.rstrip('/') in ('', '/login', '/nlogin/login'):
+            self._count('login')
+            return 200, 'text/html', LOGIN_PAGE
+        if path.startswith('/mnjuser/'):
+            self._count('home')
+            return 200, 'text/html', HOME_PAGE
+        if path == '/careers':
+            self._count('external')
+            return 200, 'text/html', EXTERNAL_PAGE
+        match = re.search(r'-(\d{12})$', path)
+        if path.startswith('/job-listings-') and match and match.group(1) in self.jobs:
+            self._count('job')
+            return 200, 'text/html', render_job_page(self.jobs[match.group(1)], self.external_url)
+        if '-jobs' in path:
+            self._count('search')
+            page_match = re.search(r'-(\d{1,3})$', path)
+            page = int(page_match.group(1)) if page_match else 1
+            start = (page - 1) * JOBS_PER_PAGE
+            # Odd pages show the popup the scraper tries to close
+            return 200, 'text/html', render_search_page(self._job_list[start:start + JOBS_PER_PAGE], page, page % 2 == 1)
+        self._count('not_found')
+        return 404, 'text/html', '<!DOCTYPE html><html><body>Not found</body></html>'
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, method):
+                if server.latency:
+                    time.sleep(server.latency)
+                status, content_type, body = server.route(method, urlparse(self.path).path)
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="replay-server")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', help="directory of recorded pages served before the generated ones")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--quota', type=int, help="show the daily quota message after this many applications")
+    args = parser.parse_args()
+    server = ReplayServer(args.port, args.fixtures, args.latency, args.quota).start()
+    print(f"Serving Naukri fixtures on {server.base_url} (login at {server.base_url}/login)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
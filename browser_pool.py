@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from auto_apply import create_driver, login_naukri
+
+BROWSER_PROFILE_DIR = 'browser_profiles'
+BROWSER_IDLE_TIMEOUT = 15 * 60
+BROWSER_MAX_PER_USER = 4
+BROWSER_REAP_INTERVAL = 60
+NAUKRI_HOME_URL = 'https://www.naukri.com/mnjuser/homepage'
+
+class PooledBrowser:
+    def __init__(self, driver, slot):
+        self.driver = driver
+        self.wait = WebDriverWait(driver, 20)
+        self.slot = slot
+        self.logged_in = False
+        self.last_used = time.monotonic()
+
+class BrowserPool:
+    """
+    Long-lived Chrome drivers kept per user across Streamlit reruns. Each driver
+    gets its own persistent profile directory, login cookies are saved per user
+    and restored into new drivers, idle drivers are health-checked before reuse
+    and quit after BROWSER_IDLE_TIMEOUT.
+    """
+
+    def __init__(self, idle_timeout=BROWSER_IDLE_TIMEOUT, max_per_user=BROWSER_MAX_PER_USER, resource_profile=None):
+        self.idle_timeout = idle_timeout
+        self.max_per_user = max_per_user
+        self.resource_profile = resource_profile
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._slots = {}
+        reaper = threading.Thread(target=self._reap, daemon=True, name="browser-pool-reaper")
+        reaper.start()
+
+    def _user_key(self, credentials):
+        return hashlib.sha256(credentials['email'].encode()).hexdigest()[:16]
+
+    def _user_dir(self, key):
+        return os.path.join(BROWSER_PROFILE_DIR, key)
+
+    def _is_healthy(self, browser):
+        try:
+            browser.driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def _close(self, key, browser):
+        try:
+            browser.driver.quit()
+        except WebDriverException:
+            pass
+        with self._lock:
+            self._slots.get(key, set()).discard(browser.slot)
+
+    def _start_browser(self, key):
+        """Start a driver on the first free profile slot, falling back to a temporary profile."""
+        for slot in range(self.max_per_user):
+            with self._lock:
+                used = self._slots.setdefault(key, set())
+                if slot in used:
+                    continue
+                used.add(slot)
+            try:
+                driver = create_driver(profile_dir=os.path.join(self._user_dir(key), f"slot{slot}"),
+                                       resource_profile=self.resource_profile)
+                return PooledBrowser(driver, slot)
+            except WebDriverException:
+                # Profile locked by another process or corrupted; try the next slot
+                with self._lock:
+                    used.discard(slot)
+        return PooledBrowser(create_driver(resource_profile=self.resource_profile), None)
+
+    def acquire(self, credentials):
+        """Return a healthy idle browser for the user, or start a new one."""
+        key = self._user_key(credentials)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                browser = idle.pop() if idle else None
+            if browser is None:
+                return self._start_browser(key)
+            if self._is_healthy(browser):
+                return browser
+            self._close(key, browser)
+
+    def release(self, credentials, browser, reusable=True):
+        """Hand a browser back to the pool, or quit it if it can't be reused."""
+        key = self._user_key(credentials)
+        if not reusable or browser.slot is None or not self._is_healthy(browser):
+            self._close(key, browser)
+            return
+        browser.last_used = time.monotonic()
+        with self._lock:
+            self._idle.setdefault(key, []).append(browser)
+
+    def _cookies_path(self, key):
+        return os.path.join(self._user_dir(key), 'cookies.json')
+
+    def _ensure_logged_in(self, key, browser, credentials):
+        """Reuse the session from the profile or saved cookies, logging in only when both fail."""
+        if browser.logged_in:
+            return True
+        driver = browser.driver
+        driver.get(NAUKRI_HOME_URL)
+        if 'login' in driver.current_url and os.path.exists(self._cookies_path(key)):
+            try:
+                with open(self._cookies_path(key)) as f:
+                    cookies = json.load(f)
+                for cookie in cookies:
+                    cookie.pop('sameSite', None)
+                    try:
+                        driver.add_cookie(cookie)
+                    except WebDriverException:
+                        continue
+                driver.get(NAUKRI_HOME_URL)
+            except (OSError, ValueError, WebDriverException):
+                pass
+        if 'login' not in driver.current_url:
+            browser.logged_in = True
+            return True
+        if not login_naukri(driver, browser.wait, credentials):
+            return False
+        try:
+            browser.wait.until(lambda d: 'login' not in d.current_url)
+        except Exception:
+            return False
+        os.makedirs(self._user_dir(key), exist_ok=True)
+        with open(self._cookies_path(key), 'w') as f:
+            json.dump(driver.get_cookies(), f)
+        browser.logged_in = True
+        return True
+
+    @contextmanager
+    def session(self, credentials):
+        """
+        Yield (driver, wait) for a logged-in browser from the pool, or (None, None)
+        if the login failed. The browser goes back to the pool afterwards unless
+        the block raised.
+        """
+        key = self._user_key(credentials)
+        browser = self.acquire(credentials)
+        reusable = False
+        try:
+            if self._ensure_logged_in(key, browser, credentials):
+                yield browser.driver, browser.wait
+                reusable = True
+            else:
+                yield None, None
+        finally:
+            self.release(credentials, browser, reusable)
+
+    def evict_idle(self):
+        """Quit browsers that have been idle longer than idle_timeout."""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._lock:
+            for key, idle in self._idle.items():
+                expired.extend((key, browser) for browser in idle if browser.last_used < cutoff)
+                idle[:] = [browser for browser in idle if browser.last_used >= cutoff]
+        for key, browser in expired:
+            self._close(key, browser)
+        return len(expired)
+
+    def close_all(self):
+        with self._lock:
+            idle = [(key, browser) for key, browsers in self._idle.items() for browser in browsers]
+            self._idle.clear()
+        for key, browser in idle:
+            self._close(key, browser)
+
+    def _reap(self):
+        while True:
+            time.sleep(BROWSER_REAP_INTERVAL)
+            self.evict_idle()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool():
+    """Return the process-wide browser pool; module state survives Streamlit reruns."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
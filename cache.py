@@ -0,0 +1,123 @@
+import hashlib
+import threading
+import time
+
+from database import connection, init_db
+
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+# Running total of stored response sizes, so a write only scans the table when it pushes it past the cap
+_size = None
+_size_lock = threading.Lock()
+
+def init_cache():
+    """The analysis_cache table is one of database.py's migrations, on the pooled connections."""
+    init_db()
+
+def normalize_text(text):
+    """Collapse whitespace so formatting-only differences map to the same key."""
+    return " ".join((text or "").split())
+
+def make_cache_key(resume_text, job_description, analysis_option, model_name, prompt=""):
+    """
+    Build a content-addressed key from the normalized resume, job description,
+    analysis option and model name. The prompt is folded in so that edits to
+    the prompt templates invalidate old entries.
+    """
+    parts = [
+        normalize_text(resume_text),
+        normalize_text(job_description),
+        analysis_option or "",
+        model_name or "",
+        normalize_text(prompt),
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+def _record(stat, count=1):
+    with _stats_lock:
+        _stats[stat] += count
+
+def get_cached_analysis(cache_key):
+    """Return the cached response for the key, or None if missing or expired."""
+    global _size
+    now = time.time()
+    with connection() as conn:
+        row = conn.execute('SELECT response, size, created_at FROM analysis_cache WHERE cache_key = ?',
+                           (cache_key,)).fetchone()
+        if row is None:
+            _record('misses')
+            return None
+        response, size, created_at = row
+        if now - created_at > CACHE_TTL_SECONDS:
+            conn.execute('DELETE FROM analysis_cache WHERE cache_key = ?', (cache_key,))
+        else:
+            conn.execute('UPDATE analysis_cache SET last_accessed = ? WHERE cache_key = ?', (now, cache_key))
+            _record('hits')
+            return response
+    with _size_lock:
+        if _size is not None:
+            _size -= size
+    _record('misses')
+    _record('evictions')
+    return None
+
+def cache_analysis(cache_key, response):
+    """Store a response and evict old entries if this write took the cache past CACHE_MAX_BYTES."""
+    global _size
+    now = time.time()
+    size = len(response.encode())
+    with _size_lock:
+        with connection() as conn:
+            if _size is None:
+                _size = conn.execute('SELECT COALESCE(SUM(size), 0) FROM analysis_cache').fetchone()[0]
+            replaced = conn.execute('SELECT size FROM analysis_cache WHERE cache_key = ?', (cache_key,)).fetchone()
+            conn.execute('''
+                INSERT OR REPLACE INTO analysis_cache (cache_key, response, size, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (cache_key, response, size, now, now))
+        _size += size - (replaced[0] if replaced else 0)
+        over_limit = _size > CACHE_MAX_BYTES
+    if over_limit:
+        evict_cache()
+
+def evict_cache(max_bytes=CACHE_MAX_BYTES, ttl_seconds=CACHE_TTL_SECONDS):
+    """
+    Drop expired entries, then the least recently used ones until the total
+    stored size is under max_bytes. Returns the number of evicted entries.
+    """
+    global _size
+    with _size_lock:
+        with connection() as conn:
+            evicted = conn.execute('DELETE FROM analysis_cache WHERE created_at < ?',
+                                   (time.time() - ttl_seconds,)).rowcount
+            total_size = conn.execute('SELECT COALESCE(SUM(size), 0) FROM analysis_cache').fetchone()[0]
+            if total_size > max_bytes:
+                stale_keys = []
+                entries = conn.execute('SELECT cache_key, size FROM analysis_cache ORDER BY last_accessed').fetchall()
+                for cache_key, size in entries:
+                    if total_size <= max_bytes:
+                        break
+                    stale_keys.append((cache_key,))
+                    total_size -= size
+                conn.executemany('DELETE FROM analysis_cache WHERE cache_key = ?', stale_keys)
+                evicted += len(stale_keys)
+        # Recounted here, so writes from another process sharing the database don't leave it drifting
+        _size = total_size
+    if evicted:
+        _record('evictions', evicted)
+    return evicted
+
+def get_cache_stats():
+    """Return hit/miss/eviction counters for this process plus current cache size."""
+    with connection() as conn:
+        entries, total_size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analysis_cache').fetchone()
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    stats['entries'] = entries
+    stats['size_bytes'] = total_size
+    return stats
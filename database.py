@@ -1,56 +1,733 @@
+import atexit
+import os
+import queue
 import sqlite3
 import hashlib
-from datetime import datetime
+import hmac
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 
-def init_db():
-    conn = sqlite3.connect('user_data.db')
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
+DB_PATH = 'user_data.db'
+DB_POOL_SIZE = 8
+DB_BUSY_TIMEOUT = 30
+# Per-connection cache of compiled statements, so repeated queries skip the SQL parser
+DB_STATEMENT_CACHE = 256
+# update_job_status writes are queued and committed together every DB_BATCH_SIZE rows or DB_BATCH_INTERVAL seconds
+DB_BATCH_SIZE = 50
+DB_BATCH_INTERVAL = 0.5
+# A batch that fails this many background writes in a row is dropped, so one bad row can't stall the queue
+DB_BATCH_RETRIES = 5
+
+# scrypt cost: 128 * N * r bytes of memory per hash (16 MiB) and ~50 ms of CPU
+PASSWORD_SCRYPT_N = 2 ** 14
+PASSWORD_SCRYPT_R = 8
+PASSWORD_SCRYPT_P = 1
+PASSWORD_SCRYPT_MAXMEM = 64 * 1024 * 1024
+PASSWORD_SALT_BYTES = 16
+PASSWORD_HASH_BYTES = 32
+
+# Job index statuses that mean a job never needs another page load
+JOB_DONE_STATUSES = ('applied', 'already_applied', 'external')
+# Background Auto Apply run statuses that never change again
+RUN_FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+# Width in match percentage points of the buckets in application_score_daily
+APPLICATION_SCORE_BUCKET = 10
+
+# Schema changes in order; the database's PRAGMA user_version is the number already applied.
+# Append new steps here instead of editing earlier ones.
+MIGRATIONS = (
+    (
+        '''CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             username TEXT UNIQUE NOT NULL,
             password TEXT NOT NULL,
             email TEXT UNIQUE NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
+        )''',
+        '''CREATE TABLE IF NOT EXISTS job_index (
+            user_email TEXT NOT NULL,
+            job_id TEXT NOT NULL,
+            url TEXT NOT NULL,
+            info TEXT,
+            match_score REAL,
+            status TEXT NOT NULL DEFAULT 'seen',
+            first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_email, job_id)
+        )''',
+        '''CREATE TABLE IF NOT EXISTS skill_profiles (
+            resume_hash TEXT PRIMARY KEY,
+            skills TEXT NOT NULL,
+            years_experience REAL,
+            titles TEXT NOT NULL,
+            source TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''',
+        '''CREATE TABLE IF NOT EXISTS auto_apply_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_email TEXT NOT NULL,
+            params TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            state TEXT,
+            progress TEXT,
+            error TEXT,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            started_at TIMESTAMP,
+            heartbeat_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )''',
+        '''CREATE TABLE IF NOT EXISTS auto_apply_run_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_auto_apply_runs_user ON auto_apply_runs (user_email, id)',
+        'CREATE INDEX IF NOT EXISTS idx_auto_apply_run_events_run ON auto_apply_run_events (run_id, id)',
+    ),
+    (
+        # Every job an Auto Apply run decided on, with day as YYYY-MM-DD in UTC
+        '''CREATE TABLE application_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_email TEXT NOT NULL,
+            job_id TEXT NOT NULL,
+            url TEXT NOT NULL,
+            company TEXT,
+            outcome TEXT NOT NULL,
+            reason TEXT,
+            match_score REAL,
+            day TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL
+        )''',
+        'CREATE INDEX idx_application_log_user_day ON application_log (user_email, day)',
+        'CREATE INDEX idx_application_log_day ON application_log (day)',
+        'CREATE INDEX idx_application_log_company ON application_log (user_email, company, day)',
+        'CREATE INDEX idx_application_log_outcome ON application_log (user_email, outcome, day)',
+        # Daily rollups kept up to date by every application_log write, so the dashboard never scans the log
+        '''CREATE TABLE application_daily (
+            user_email TEXT NOT NULL,
+            day TEXT NOT NULL,
+            outcome TEXT NOT NULL,
+            reason TEXT NOT NULL DEFAULT '',
+            count INTEGER NOT NULL,
+            PRIMARY KEY (user_email, day, outcome, reason)
+        ) WITHOUT ROWID''',
+        '''CREATE TABLE application_score_daily (
+            user_email TEXT NOT NULL,
+            day TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (user_email, day, bucket)
+        ) WITHOUT ROWID''',
+    ),
+    (
+        # Applications made per user and UTC day across all runs, and whether Naukri reported its own quota
+        '''CREATE TABLE apply_quota (
+            user_email TEXT NOT NULL,
+            day TEXT NOT NULL,
+            used INTEGER NOT NULL DEFAULT 0,
+            site_quota_reached INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_email, day)
+        ) WITHOUT ROWID''',
+    ),
+    (
+        # Gemini analyses by content-addressed key (cache.py), evicted by age and least recent use
+        '''CREATE TABLE IF NOT EXISTS analysis_cache (
+            cache_key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_accessed REAL NOT NULL
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_accessed ON analysis_cache (last_accessed)',
+    ),
+)
+
+class ConnectionPool:
+    """
+    Up to size open connections to one database file, shared by the threads of
+    a process. Connections use WAL journaling, so readers don't block the
+    writer, and wait up to DB_BUSY_TIMEOUT seconds for another process's lock.
+    """
+
+    def __init__(self, path=DB_PATH, size=DB_POOL_SIZE):
+        self.path = path
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=DB_BUSY_TIMEOUT, check_same_thread=False,
+                               cached_statements=DB_STATEMENT_CACHE)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={DB_BUSY_TIMEOUT * 1000}')
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Yield a pooled connection; commit when the block succeeds, roll back when it raises."""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return this process's connection pool. Connections are never shared with forked children."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool()
+            _pool_pid = os.getpid()
+        return _pool
+
+def connection():
+    return get_pool().connection()
+
+class BatchWriter:
+    """
+    Write-behind queue for one kind of row: write(conn, rows) commits them in a
+    single transaction once DB_BATCH_SIZE are waiting or the oldest has waited
+    DB_BATCH_INTERVAL seconds. A batch that fails goes back to the front of the
+    queue and is retried every DB_BATCH_INTERVAL, up to DB_BATCH_RETRIES times.
+    flush() blocks until everything queued is written; it raises if that write
+    fails, or re-raises the error of a batch the background writer had to drop.
+    """
+
+    def __init__(self, write, batch_size=DB_BATCH_SIZE, interval=DB_BATCH_INTERVAL):
+        self.write = write
+        self.batch_size = batch_size
+        self.interval = interval
+        self._rows = []
+        self._cond = threading.Condition()
+        # Held from taking a batch until it is committed, so batches land in the order they were queued
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self._error = None
+        self._failures = 0
+        self._failed_rows = 0
+
+    def add(self, row):
+        with self._cond:
+            if self._thread is None or self._thread_pid != os.getpid() or not self._thread.is_alive():
+                if self._thread_pid != os.getpid():
+                    # Rows queued before a fork belong to the parent's writer
+                    self._rows = []
+                self._thread = threading.Thread(target=self._run, daemon=True, name="db-batch-writer")
+                self._thread_pid = os.getpid()
+                self._thread.start()
+            self._rows.append(row)
+            if len(self._rows) >= self.batch_size:
+                self._cond.notify_all()
+
+    def _write_pending(self):
+        # Caller holds _write_lock
+        with self._cond:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return
+        try:
+            with connection() as conn:
+                self.write(conn, rows)
+        except Exception:
+            with self._cond:
+                self._rows[:0] = rows
+            self._failed_rows = len(rows)
+            raise
+        self._failures = 0
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._rows)
+                self._cond.wait_for(lambda: len(self._rows) >= self.batch_size, timeout=self.interval)
+            with self._write_lock:
+                try:
+                    self._write_pending()
+                    continue
+                except Exception as e:
+                    self._failures += 1
+                    if self._failures >= DB_BATCH_RETRIES:
+                        with self._cond:
+                            del self._rows[:self._failed_rows]
+                        self._failures = 0
+                        self._error = e
+            time.sleep(self.interval)
+
+    def flush(self):
+        with self._write_lock:
+            error, self._error = self._error, None
+            self._write_pending()
+        if error is not None:
+            raise error
+
+def _write_job_statuses(conn, rows):
+    conn.executemany('''
+        INSERT INTO job_index (user_email, job_id, url, info, match_score, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_email, job_id) DO UPDATE SET
+            info = COALESCE(excluded.info, info),
+            match_score = COALESCE(excluded.match_score, match_score),
+            status = excluded.status,
+            updated_at = CURRENT_TIMESTAMP
+    ''', rows)
+
+def score_bucket(match_score):
+    """Lower bound of the APPLICATION_SCORE_BUCKET wide bucket a match percentage falls in, or None."""
+    if match_score is None:
+        return None
+    return min(int(match_score // APPLICATION_SCORE_BUCKET) * APPLICATION_SCORE_BUCKET, 100 - APPLICATION_SCORE_BUCKET)
+
+def _write_applications(conn, rows):
+    """Insert a batch into application_log and add it to the daily rollups in the same transaction."""
+    conn.executemany('''
+        INSERT INTO application_log (user_email, job_id, url, company, outcome, reason, match_score, day, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    outcomes = Counter((user_email, day, outcome, reason or '')
+                       for user_email, _, _, _, outcome, reason, _, day, _ in rows)
+    conn.executemany('''
+        INSERT INTO application_daily (user_email, day, outcome, reason, count) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (user_email, day, outcome, reason) DO UPDATE SET count = count + excluded.count
+    ''', [key + (count,) for key, count in outcomes.items()])
+    scores = Counter((user_email, day, score_bucket(match_score))
+                     for user_email, _, _, _, _, _, match_score, day, _ in rows if match_score is not None)
+    conn.executemany('''
+        INSERT INTO application_score_daily (user_email, day, bucket, count) VALUES (?, ?, ?, ?)
+        ON CONFLICT (user_email, day, bucket) DO UPDATE SET count = count + excluded.count
+    ''', [key + (count,) for key, count in scores.items()])
+
+_job_status_writer = BatchWriter(_write_job_statuses)
+_application_writer = BatchWriter(_write_applications)
+
+def flush_writes():
+    """Write every queued update_job_status and log_application row now."""
+    _job_status_writer.flush()
+    _application_writer.flush()
+
+atexit.register(flush_writes)
+
+_migrated = False
+_migrate_lock = threading.Lock()
+
+def migrate():
+    """Apply the MIGRATIONS the database doesn't have yet, each in one transaction."""
+    with connection() as conn:
+        # Take the write lock before reading the version, so two processes never apply the same step
+        conn.execute('BEGIN IMMEDIATE')
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for number, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {number}')
+
+def init_db():
+    """Bring the schema up to date; only the first call in a process touches the database."""
+    global _migrated
+    with _migrate_lock:
+        if not _migrated:
+            migrate()
+            _migrated = True
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=PASSWORD_SCRYPT_MAXMEM, dklen=PASSWORD_HASH_BYTES)
 
 def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Salted scrypt hash stored as 'scrypt$n$r$p$salt$hash' (hex), so the cost can change later."""
+    salt = os.urandom(PASSWORD_SALT_BYTES)
+    digest = _scrypt(password, salt, PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    return f"scrypt${PASSWORD_SCRYPT_N}${PASSWORD_SCRYPT_R}${PASSWORD_SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+def check_password(password, stored):
+    """Return (matches, needs_rehash) for a stored hash, including the old unsalted SHA-256 ones."""
+    if not stored.startswith('scrypt$'):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        matches = hmac.compare_digest(legacy, stored)
+        return matches, matches
+    _, n, r, p, salt, digest = stored.split('$')
+    n, r, p = int(n), int(r), int(p)
+    matches = hmac.compare_digest(_scrypt(password, bytes.fromhex(salt), n, r, p).hex(), digest)
+    needs_rehash = (n, r, p) != (PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    return matches, matches and needs_rehash
+
+# Checked for unknown emails, so they take as long as a wrong password
+_DUMMY_HASH = None
 
 def create_user(username, password, email):
-    conn = sqlite3.connect('user_data.db')
-    c = conn.cursor()
     try:
-        hashed_pwd = hash_password(password)
-        c.execute('INSERT INTO users (username, password, email) VALUES (?, ?, ?)',
-                 (username, hashed_pwd, email))
-        conn.commit()
+        with connection() as conn:
+            conn.execute('INSERT INTO users (username, password, email) VALUES (?, ?, ?)',
+                         (username, hash_password(password), email))
         return True
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
 
 def verify_user(email, password):
     """
-    Verify if the user exists in the database using email and password.
-    """
-    conn = sqlite3.connect('user_data.db')
-    c = conn.cursor()
-    hashed_pwd = hash_password(password)
-    c.execute('SELECT * FROM users WHERE email = ? AND password = ?',
-             (email, hashed_pwd))
-    user = c.fetchone()
-    conn.close()
-    return user is not None
-
-def get_data():
-    conn = sqlite3.connect('user_data.db')
-    c = conn.cursor()
-    c.execute("SELECT email, password FROM users")
-    data = c.fetchall()
-    conn.close()
-    return data
\ No newline at end of file
+    Verify the email and password with one lookup on the unique email index.
+    A hash made with an older scheme or cost is replaced on a successful login.
+    """
+    global _DUMMY_HASH
+    with connection() as conn:
+        row = conn.execute('SELECT password FROM users WHERE email = ?', (email,)).fetchone()
+    if row is None:
+        if _DUMMY_HASH is None:
+            _DUMMY_HASH = hash_password('')
+        check_password(password, _DUMMY_HASH)
+        return False
+    stored = row[0]
+    matches, needs_rehash = check_password(password, stored)
+    if needs_rehash:
+        with connection() as conn:
+            # Only if nobody changed it meanwhile
+            conn.execute('UPDATE users SET password = ? WHERE email = ? AND password = ?',
+                         (hash_password(password), email, stored))
+    return matches
+
+def index_job_links(user_email, jobs):
+    """
+    Add (job_id, url) pairs found on search pages to the user's job index.
+    Jobs that are already indexed keep their existing state.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        c.executemany('INSERT OR IGNORE INTO job_index (user_email, job_id, url) VALUES (?, ?, ?)',
+                      [(user_email, job_id, url) for job_id, url in jobs])
+
+def get_indexed_jobs(user_email, job_ids):
+    """Return {job_id: {'url', 'info', 'match_score', 'status'}} for the indexed jobs among job_ids."""
+    flush_writes()
+    job_ids = list(job_ids)
+    indexed = {}
+    with connection() as conn:
+        c = conn.cursor()
+        for start in range(0, len(job_ids), 500):
+            chunk = job_ids[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            c.execute(f'''
+                SELECT job_id, url, info, match_score, status FROM job_index
+                WHERE user_email = ? AND job_id IN ({placeholders})
+            ''', [user_email] + chunk)
+            for job_id, url, info, match_score, status in c.fetchall():
+                indexed[job_id] = {
+                    'url': url,
+                    'info': json.loads(info) if info else None,
+                    'match_score': match_score,
+                    'status': status
+                }
+    return indexed
+
+def update_job_status(user_email, job_id, url, status, info=None, match_score=None):
+    """
+    Record the extracted info, match score and outcome for a job, keeping earlier
+    values when not given. The write is batched; readers of job_index call flush_writes() first.
+    """
+    _job_status_writer.add((user_email, job_id, url, json.dumps(info) if info is not None else None,
+                            match_score, status))
+
+def get_stored_skill_profile(resume_hash):
+    """Return the stored skill profile for a resume hash, or None."""
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('SELECT skills, years_experience, titles, source FROM skill_profiles WHERE resume_hash = ?',
+                  (resume_hash,))
+        row = c.fetchone()
+    if row is None:
+        return None
+    skills, years_experience, titles, source = row
+    return {
+        'skills': json.loads(skills),
+        'years_experience': years_experience,
+        'titles': json.loads(titles),
+        'source': source
+    }
+
+def save_skill_profile(resume_hash, profile):
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            INSERT OR REPLACE INTO skill_profiles (resume_hash, skills, years_experience, titles, source)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (resume_hash, json.dumps(profile['skills']), profile['years_experience'],
+              json.dumps(profile['titles']), profile['source']))
+
+_RUN_COLUMNS = '''id, user_email, params, status, state, progress, error, cancel_requested,
+                  created_at, started_at, heartbeat_at, finished_at'''
+
+def _run_from_row(row):
+    run_id, user_email, params, status, state, progress, error, cancel_requested, \
+        created_at, started_at, heartbeat_at, finished_at = row
+    return {
+        'id': run_id,
+        'user_email': user_email,
+        'params': json.loads(params),
+        'status': status,
+        'state': json.loads(state) if state else {},
+        'progress': json.loads(progress) if progress else {},
+        'error': error,
+        'cancel_requested': bool(cancel_requested),
+        'created_at': created_at,
+        'started_at': started_at,
+        'heartbeat_at': heartbeat_at,
+        'finished_at': finished_at
+    }
+
+def enqueue_auto_apply_run(user_email, params):
+    """Queue a background Auto Apply run and return its id."""
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('INSERT INTO auto_apply_runs (user_email, params) VALUES (?, ?)', (user_email, json.dumps(params)))
+        run_id = c.lastrowid
+    return run_id
+
+def get_auto_apply_run(run_id):
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(f'SELECT {_RUN_COLUMNS} FROM auto_apply_runs WHERE id = ?', (run_id,))
+        row = c.fetchone()
+    return _run_from_row(row) if row else None
+
+def get_auto_apply_runs(user_email, limit=10):
+    """Return the user's most recent runs, newest first."""
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute(f'SELECT {_RUN_COLUMNS} FROM auto_apply_runs WHERE user_email = ? ORDER BY id DESC LIMIT ?',
+                  (user_email, limit))
+        rows = c.fetchall()
+    return [_run_from_row(row) for row in rows]
+
+def claim_auto_apply_run(run_id):
+    """Mark a queued run as running. Returns False if it was cancelled or claimed meanwhile."""
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            UPDATE auto_apply_runs
+            SET status = 'running', started_at = COALESCE(started_at, CURRENT_TIMESTAMP), heartbeat_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'queued' AND cancel_requested = 0
+        ''', (run_id,))
+        claimed = c.rowcount == 1
+    return claimed
+
+def requeue_auto_apply_run(run_id):
+    """Put an interrupted run back in the queue. Returns False if it isn't interrupted."""
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            UPDATE auto_apply_runs SET status = 'queued', error = NULL, heartbeat_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status = 'interrupted' AND cancel_requested = 0
+        ''', (run_id,))
+        requeued = c.rowcount == 1
+    return requeued
+
+def update_auto_apply_run(run_id, status=None, state=None, progress=None, error=None):
+    """Update a run's status, checkpoint state or progress, refreshing its heartbeat."""
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            UPDATE auto_apply_runs SET
+                status = COALESCE(?, status),
+                state = COALESCE(?, state),
+                progress = COALESCE(?, progress),
+                error = COALESCE(?, error),
+                heartbeat_at = CURRENT_TIMESTAMP,
+                finished_at = CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE finished_at END
+            WHERE id = ?
+        ''', (status, json.dumps(state) if state is not None else None,
+              json.dumps(progress) if progress is not None else None, error,
+              status in RUN_FINISHED_STATUSES, run_id))
+
+def request_auto_apply_run_cancel(run_id):
+    """
+    Ask a run to stop. Queued and interrupted runs are cancelled right away,
+    a running one stops at its next job or search page.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            UPDATE auto_apply_runs SET
+                cancel_requested = 1,
+                finished_at = CASE WHEN status IN ('queued', 'interrupted') THEN CURRENT_TIMESTAMP ELSE finished_at END,
+                status = CASE WHEN status IN ('queued', 'interrupted') THEN 'cancelled' ELSE status END
+            WHERE id = ? AND status NOT IN ('completed', 'failed', 'cancelled')
+        ''', (run_id,))
+
+def is_auto_apply_run_cancelled(run_id):
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('SELECT cancel_requested FROM auto_apply_runs WHERE id = ?', (run_id,))
+        row = c.fetchone()
+    return bool(row and row[0])
+
+def interrupt_stale_auto_apply_runs(stale_after):
+    """
+    Mark queued or running runs whose heartbeat is older than stale_after seconds
+    as interrupted. Their process is gone, but they can resume from their checkpoint.
+    """
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            UPDATE auto_apply_runs SET status = 'interrupted'
+            WHERE status IN ('queued', 'running')
+              AND COALESCE(heartbeat_at, created_at) < datetime('now', ?)
+        ''', (f'-{int(stale_after)} seconds',))
+        interrupted = c.rowcount
+    return interrupted
+
+def add_auto_apply_run_events(run_id, messages):
+    with connection() as conn:
+        c = conn.cursor()
+        c.executemany('INSERT INTO auto_apply_run_events (run_id, message) VALUES (?, ?)',
+                      [(run_id, message) for message in messages])
+
+def get_auto_apply_run_events(run_id, limit=50):
+    """Return the run's last limit checkpoint messages as (created_at, message), oldest first."""
+    with connection() as conn:
+        c = conn.cursor()
+        c.execute('''
+            SELECT created_at, message FROM auto_apply_run_events
+            WHERE run_id = ? ORDER BY id DESC LIMIT ?
+        ''', (run_id, limit))
+        rows = c.fetchall()
+    return rows[::-1]
+
+def log_application(user_email, job_id, url, outcome, company=None, reason=None, match_score=None):
+    """
+    Queue one Auto Apply decision for application_log and the daily rollups.
+    outcome is the job's status (applied, rejected, failed, ...), reason why
+    it was rejected or failed. Batched like update_job_status.
+    """
+    now = datetime.now(timezone.utc)
+    _application_writer.add((user_email, job_id, url, company, outcome, reason, match_score,
+                             now.strftime('%Y-%m-%d'), now.strftime('%Y-%m-%d %H:%M:%S')))
+
+def _since_day(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+
+def get_application_daily_counts(user_email, days=30):
+    """Return [(day, outcome, count)] over the last days days, from the daily rollup."""
+    flush_writes()
+    with connection() as conn:
+        return conn.execute('''
+            SELECT day, outcome, SUM(count) FROM application_daily
+            WHERE user_email = ? AND day >= ?
+            GROUP BY day, outcome ORDER BY day
+        ''', (user_email, _since_day(days))).fetchall()
+
+def get_application_reasons(user_email, outcomes=('rejected', 'failed'), days=30):
+    """Return [(outcome, reason, count)] for the given outcomes over the last days days, most frequent first."""
+    flush_writes()
+    placeholders = ', '.join('?' * len(outcomes))
+    with connection() as conn:
+        return conn.execute(f'''
+            SELECT outcome, reason, SUM(count) AS total FROM application_daily
+            WHERE user_email = ? AND day >= ? AND outcome IN ({placeholders})
+            GROUP BY outcome, reason ORDER BY total DESC
+        ''', [user_email, _since_day(days)] + list(outcomes)).fetchall()
+
+def get_match_score_distribution(user_email, days=30):
+    """Return [(bucket, count)] of match percentages over the last days days; bucket is the lower bound."""
+    flush_writes()
+    with connection() as conn:
+        return conn.execute('''
+            SELECT bucket, SUM(count) FROM application_score_daily
+            WHERE user_email = ? AND day >= ?
+            GROUP BY bucket ORDER BY bucket
+        ''', (user_email, _since_day(days))).fetchall()
+
+def get_applications(user_email, limit=50, outcome=None, company=None):
+    """Return the user's most recent application_log rows as dicts, optionally for one outcome or company."""
+    flush_writes()
+    query = 'SELECT day, created_at, company, outcome, reason, match_score, url FROM application_log WHERE user_email = ?'
+    args = [user_email]
+    if outcome:
+        query += ' AND outcome = ?'
+        args.append(outcome)
+    if company:
+        query += ' AND company = ?'
+        args.append(company)
+    query += ' ORDER BY day DESC, id DESC LIMIT ?'
+    args.append(limit)
+    with connection() as conn:
+        rows = conn.execute(query, args).fetchall()
+    return [{'day': day, 'created_at': created_at, 'company': company, 'outcome': outcome, 'reason': reason,
+             'match_score': match_score, 'url': url}
+            for day, created_at, company, outcome, reason, match_score, url in rows]
+
+def _today():
+    # The UTC day, like application_log and its rollups, so the quota and the dashboard agree
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+def reserve_application(user_email, daily_limit):
+    """
+    Take one application from the user's budget for today, shared by all their
+    runs. Returns the day it was counted on, or None when today's daily_limit
+    is used up or Naukri reported its own daily quota. The check and the
+    increment are one statement, so concurrent runs can't overshoot.
+    """
+    if daily_limit <= 0:
+        return None
+    day = _today()
+    with connection() as conn:
+        cursor = conn.execute('''
+            INSERT INTO apply_quota (user_email, day, used) VALUES (?, ?, 1)
+            ON CONFLICT (user_email, day) DO UPDATE SET used = used + 1
+            WHERE used < ? AND site_quota_reached = 0
+        ''', (user_email, day, daily_limit))
+        return day if cursor.rowcount else None
+
+def release_application(user_email, day):
+    """Give back an application reserved on day that wasn't made (the apply failed or went off-site)."""
+    with connection() as conn:
+        conn.execute('UPDATE apply_quota SET used = MAX(used - 1, 0) WHERE user_email = ? AND day = ?',
+                     (user_email, day))
+
+def exhaust_daily_quota(user_email):
+    """Record that Naukri reported the user's daily quota as reached, so no run applies again today."""
+    with connection() as conn:
+        conn.execute('''
+            INSERT INTO apply_quota (user_email, day, used, site_quota_reached) VALUES (?, ?, 0, 1)
+            ON CONFLICT (user_email, day) DO UPDATE SET site_quota_reached = 1
+        ''', (user_email, _today()))
+
+def get_remaining_applications(user_email, daily_limit):
+    """Applications left in the user's budget for today."""
+    with connection() as conn:
+        row = conn.execute('SELECT used, site_quota_reached FROM apply_quota WHERE user_email = ? AND day = ?',
+                           (user_email, _today())).fetchone()
+    if row is None:
+        return max(daily_limit, 0)
+    used, site_quota_reached = row
+    return 0 if site_quota_reached else max(daily_limit - used, 0)
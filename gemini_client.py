@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import google.generativeai as genai
+from google.api_core import exceptions as api_exceptions
+
+GEMINI_MAX_CONCURRENCY = 4
+GEMINI_REQUESTS_PER_MINUTE = 60
+GEMINI_MAX_RETRIES = 4
+GEMINI_BACKOFF_BASE = 1.0
+GEMINI_BACKOFF_MAX = 30.0
+GEMINI_TIMEOUT = 60
+
+# Errors worth retrying: quota (429), overload (503), server errors and timeouts
+RETRYABLE_ERRORS = (
+    api_exceptions.ResourceExhausted,
+    api_exceptions.TooManyRequests,
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.InternalServerError,
+    api_exceptions.DeadlineExceeded,
+    TimeoutError,
+)
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at rate tokens per second."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+class GeminiClient:
+    """
+    Shared Gemini client. Calls run on a thread pool behind a concurrency
+    semaphore and a token-bucket rate limit, retry with exponential backoff
+    on quota and server errors, and identical in-flight prompts share one call.
+    """
+
+    def __init__(self, model_name, max_concurrency=GEMINI_MAX_CONCURRENCY,
+                 requests_per_minute=GEMINI_REQUESTS_PER_MINUTE, max_retries=GEMINI_MAX_RETRIES,
+                 timeout=GEMINI_TIMEOUT):
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._bucket = TokenBucket(requests_per_minute / 60.0, max(1, max_concurrency))
+        # Extra workers so requests sleeping in backoff don't hold up new ones
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency * 2, thread_name_prefix="gemini")
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def _request_key(self, contents, generation_config=None):
+        digest = hashlib.sha256(self.model_name.encode())
+        digest.update(repr(sorted((generation_config or {}).items())).encode())
+        for part in contents:
+            digest.update(b"\x1f")
+            digest.update(str(part).encode())
+        return digest.hexdigest()
+
+    def _call(self, contents, generation_config=None):
+        for attempt in range(self.max_retries + 1):
+            self._bucket.acquire()
+            try:
+                with self._slots:
+                    response = self.model.generate_content(contents, generation_config=generation_config,
+                                                           request_options={"timeout": self.timeout})
+                return response.text
+            except RETRYABLE_ERRORS:
+                if attempt == self.max_retries:
+                    raise
+            delay = min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * 2 ** attempt)
+            time.sleep(delay * (0.5 + random.random() / 2))
+
+    def stream(self, contents):
+        """
+        Yield response text chunks as they arrive. Retries only happen before the
+        first chunk; streamed calls are not coalesced with other requests.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._bucket.acquire()
+            started = False
+            try:
+                with self._slots:
+                    response = self.model.generate_content(contents, stream=True,
+                                                           request_options={"timeout": self.timeout})
+                    for chunk in response:
+                        if chunk.parts:
+                            started = True
+                            yield chunk.text
+                return
+            except RETRYABLE_ERRORS:
+                if started or attempt == self.max_retries:
+                    raise
+            delay = min(GEMINI_BACKOFF_MAX, GEMINI_BACKOFF_BASE * 2 ** attempt)
+            time.sleep(delay * (0.5 + random.random() / 2))
+
+    def submit(self, contents, generation_config=None):
+        """Start a request and return a Future for its text; joins an identical request already in flight."""
+        key = self._request_key(contents, generation_config)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._call, list(contents), generation_config)
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def _forget(self, key):
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+
+    def generate(self, contents, generation_config=None):
+        """Blocking call returning the response text."""
+        return self.submit(contents, generation_config).result()
+
+    def generate_json(self, contents):
+        """Blocking call that asks for a JSON response and returns it parsed."""
+        return json.loads(self.generate(contents, {"response_mime_type": "application/json"}))
+
+    def generate_many(self, batch):
+        """Run a batch of requests concurrently and return their texts in order."""
+        futures = [self.submit(contents) for contents in batch]
+        return [future.result() for future in futures]
+
+    async def agenerate(self, contents):
+        """Awaitable version of generate for asyncio callers."""
+        return await asyncio.wrap_future(self.submit(contents))
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(model_name):
+    """Return the process-wide client for model_name, creating it on first use."""
+    with _clients_lock:
+        client = _clients.get(model_name)
+        if client is None:
+            client = GeminiClient(model_name)
+            _clients[model_name] = client
+        return client
@@ -0,0 +1,118 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Histogram bucket upper bounds in seconds: 1ms doubling up to ~9 minutes
+BUCKET_BOUNDS = tuple(0.001 * 2 ** i for i in range(20))
+
+class Histogram:
+    """Fixed log-scale buckets plus count, sum, min and max. Percentiles are bucket upper bounds."""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS + (self.max,), self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+_lock = threading.Lock()
+_histograms = {}
+_sink = None
+_context = {}
+
+def configure(json_path=None, **context):
+    """
+    Append every span and event as one JSON line to json_path (None turns the
+    sink off). context fields, e.g. run_id, are added to each line.
+    """
+    global _sink, _context
+    with _lock:
+        if _sink is not None:
+            _sink.close()
+        _sink = open(json_path, 'a', encoding='utf-8') if json_path else None
+        _context = dict(context)
+
+def _write(record):
+    # Caller holds _lock
+    if _sink is not None:
+        record.update(_context)
+        _sink.write(json.dumps(record) + '\n')
+        _sink.flush()
+
+def observe(name, seconds, **fields):
+    """Record one timing for name."""
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds)
+        if _sink is not None:
+            _write({'ts': time.time(), 'span': name, 'seconds': round(seconds, 6), **fields})
+
+def event(message, **fields):
+    """Write a structured event (e.g. a checkpoint message) to the JSON sink."""
+    if _sink is None:
+        return
+    with _lock:
+        _write({'ts': time.time(), 'event': message, **fields})
+
+@contextmanager
+def span(name, **fields):
+    """Time the block and record it under name, also when it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **fields)
+
+def timed(name):
+    """Decorator form of span()."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+def summary():
+    """Return one row per span name: count, total, mean, p50, p95 and max seconds, slowest total first."""
+    with _lock:
+        rows = [{
+            'span': name,
+            'count': histogram.count,
+            'total_s': round(histogram.total, 3),
+            'mean_s': round(histogram.total / histogram.count, 4),
+            'p50_s': round(histogram.percentile(0.5), 4),
+            'p95_s': round(histogram.percentile(0.95), 4),
+            'max_s': round(histogram.max, 4),
+        } for name, histogram in _histograms.items() if histogram.count]
+    rows.sort(key=lambda row: row['total_s'], reverse=True)
+    return rows
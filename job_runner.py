@@ -0,0 +1,220 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import instrumentation
+from database import (
+    enqueue_auto_apply_run, get_auto_apply_run, claim_auto_apply_run, requeue_auto_apply_run,
+    update_auto_apply_run, request_auto_apply_run_cancel, is_auto_apply_run_cancelled,
+    interrupt_stale_auto_apply_runs, add_auto_apply_run_events, flush_writes
+)
+
+JOB_WORKERS = min(4, os.cpu_count() or 1)
+JOB_HEARTBEAT_INTERVAL = 5
+# A queued or running run whose heartbeat is this old has lost its server (another one may share the database)
+JOB_STALE_AFTER = 6 * JOB_HEARTBEAT_INTERVAL
+JOB_EVENT_FLUSH_INTERVAL = 1.0
+# Spans and checkpoints of every run, one JSON object per line
+JOB_METRICS_LOG = 'auto_apply_metrics.jsonl'
+
+class RunReporter:
+    """
+    Progress listener for a run inside a worker process. Buffers checkpoint
+    messages and flushes them with the progress counters and the heartbeat at
+    most once a second; also polls the run's cancel flag and forwards it to auto_apply.
+    """
+
+    def __init__(self, run_id, state):
+        self.run_id = run_id
+        self.state = state
+        self.applied_before = state.get('applied', 0)
+        self.progress = {'stage': 'starting', 'links': len(state.get('job_links') or []),
+                         'applied': self.applied_before, 'failed': 0}
+        self._lock = threading.Lock()
+        self._messages = []
+        self._last_flush = 0.0
+        self._stopped = threading.Event()
+        self._heartbeat = threading.Thread(target=self._beat, daemon=True)
+
+    def __call__(self, message, fields):
+        with self._lock:
+            if message is not None:
+                self._messages.append(message)
+            if fields:
+                if 'applied' in fields:
+                    fields = dict(fields, applied=self.applied_before + fields['applied'])
+                    self.state['applied'] = fields['applied']
+                self.progress.update(fields)
+            due = time.monotonic() - self._last_flush >= JOB_EVENT_FLUSH_INTERVAL
+        if due or fields:
+            self.flush()
+
+    def flush(self, status=None, error=None):
+        with self._lock:
+            messages, self._messages = self._messages, []
+            self._last_flush = time.monotonic()
+            progress = dict(self.progress, timings=instrumentation.summary())
+            state = dict(self.state)
+        if messages:
+            add_auto_apply_run_events(self.run_id, messages)
+        update_auto_apply_run(self.run_id, status=status, state=state, progress=progress, error=error)
+
+    def save_state(self, state):
+        with self._lock:
+            self.state.update(state)
+        self.flush()
+
+    def _beat(self):
+        import auto_apply
+        while not self._stopped.wait(JOB_HEARTBEAT_INTERVAL):
+            if is_auto_apply_run_cancelled(self.run_id):
+                auto_apply.request_cancel()
+            self.flush()
+
+    def start(self):
+        self._heartbeat.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._heartbeat.join()
+
+def _execute_run(run_id, credentials):
+    """Worker process entry point: run one claimed Auto Apply run and record its outcome."""
+    import auto_apply
+    from browser_pool import get_browser_pool
+    from adaptive_wait import get_adaptive_waits
+    from skill_matching import get_skill_index
+
+    run = get_auto_apply_run(run_id)
+    reporter = RunReporter(run_id, run['state'])
+    auto_apply.reset_cancel()
+    auto_apply.set_verbose(run['params'].get('verbose', False))
+    auto_apply.set_progress_listener(reporter)
+    instrumentation.reset()
+    instrumentation.configure(JOB_METRICS_LOG, run_id=run_id)
+    reporter.start()
+    try:
+        result = auto_apply.run_auto_apply(credentials, run['params'], get_browser_pool(),
+                                           state=run['state'], save_state=reporter.save_state)
+        flush_writes()
+        get_skill_index().save()
+        get_adaptive_waits().save()
+        status = 'cancelled' if result['cancelled'] or auto_apply.cancel_requested() else 'completed'
+        auto_apply.checkpoint(f"Applied to {reporter.progress['applied']} jobs. Failed: {len(result['failed'])}")
+        reporter.progress['stage'] = status
+        reporter.stop()
+        reporter.flush(status=status)
+    except Exception as e:
+        reporter.progress['stage'] = 'failed'
+        reporter.stop()
+        reporter.flush(status='failed', error=str(e))
+    finally:
+        auto_apply.set_progress_listener(None)
+        instrumentation.configure(None)
+
+class JobRunner:
+    """
+    Runs Auto Apply jobs off the Streamlit script thread. Runs are queued in
+    SQLite with their parameters, progress and checkpoint; a dispatcher thread
+    hands them to a pool of worker processes, at most `workers` at a time.
+    Credentials are only ever held in memory, so a run interrupted by a restart
+    is resumed with the user's credentials from their next session.
+    """
+
+    def __init__(self, workers=JOB_WORKERS):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = deque()
+        self._credentials = {}
+        self._running = 0
+        self._executor = self._new_executor()
+        interrupt_stale_auto_apply_runs(JOB_STALE_AFTER)
+        dispatcher = threading.Thread(target=self._dispatch, daemon=True, name="job-runner-dispatcher")
+        dispatcher.start()
+
+    def _new_executor(self):
+        # Spawned workers don't inherit the Streamlit server's threads and locks
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def _replace_executor(self, broken):
+        # Every run on a broken pool fails at once; only the first to notice replaces it
+        with self._wakeup:
+            if self._executor is not broken:
+                return self._executor
+            self._executor = self._new_executor()
+            executor = self._executor
+        broken.shutdown(wait=False, cancel_futures=True)
+        return executor
+
+    def submit(self, credentials, params):
+        """Queue a run for the user and return its id."""
+        run_id = enqueue_auto_apply_run(credentials['email'], params)
+        self._schedule(run_id, credentials)
+        return run_id
+
+    def resume(self, run_id, credentials):
+        """Requeue an interrupted run; it continues from its last checkpoint. Returns False if it can't be."""
+        if not requeue_auto_apply_run(run_id):
+            return False
+        self._schedule(run_id, credentials)
+        return True
+
+    def cancel(self, run_id):
+        request_auto_apply_run_cancel(run_id)
+
+    def _schedule(self, run_id, credentials):
+        with self._wakeup:
+            self._credentials[run_id] = dict(credentials)
+            self._pending.append(run_id)
+            self._wakeup.notify()
+
+    def _dispatch(self):
+        while True:
+            with self._wakeup:
+                self._wakeup.wait_for(lambda: self._pending and self._running < self.workers,
+                                      timeout=JOB_HEARTBEAT_INTERVAL)
+                if not self._pending or self._running >= self.workers:
+                    continue
+                run_id = self._pending.popleft()
+                credentials = self._credentials.pop(run_id)
+            if not claim_auto_apply_run(run_id):
+                # Cancelled while it was waiting in the queue
+                continue
+            with self._wakeup:
+                self._running += 1
+                executor = self._executor
+            try:
+                future = executor.submit(_execute_run, run_id, credentials)
+            except BrokenProcessPool:
+                executor = self._replace_executor(executor)
+                future = executor.submit(_execute_run, run_id, credentials)
+            future.add_done_callback(
+                lambda future, run_id=run_id, executor=executor: self._finished(run_id, executor, future))
+
+    def _finished(self, run_id, executor, future):
+        try:
+            future.result()
+        except Exception as e:
+            # The worker process itself died; _execute_run records ordinary errors
+            update_auto_apply_run(run_id, status='failed', error=f"Worker process failed: {e}")
+            if isinstance(e, BrokenProcessPool):
+                self._replace_executor(executor)
+        with self._wakeup:
+            self._running -= 1
+            self._wakeup.notify()
+
+_runner = None
+_runner_lock = threading.Lock()
+
+def get_job_runner():
+    """Return the process-wide job runner; module state survives Streamlit reruns."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
@@ -0,0 +1,122 @@
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from PyPDF2 import PdfReader
+
+PDF_CACHE_SIZE = 32
+PDF_CACHE_DIR = 'pdf_cache'
+PDF_DISK_CACHE = True
+# Documents with more pages than this are extracted with a process pool
+PARALLEL_PAGE_THRESHOLD = 8
+PDF_WORKERS = 4
+# Size of the process pool shared by page extraction and batch screening
+PDF_POOL_WORKERS = min(8, max(PDF_WORKERS, os.cpu_count() or 1))
+
+_cache_lock = threading.Lock()
+_pdf_cache = OrderedDict()
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_process_pool():
+    """
+    Return the process-wide pool for PDF text extraction, started on first use.
+    Workers are spawned, not forked: a forked child of the Streamlit server would
+    inherit its threads' locks. The pool stays up, so later calls skip the start-up.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_POOL_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+def _file_bytes(uploaded_file):
+    if uploaded_file is None:
+        raise FileNotFoundError("No file uploaded")
+    if isinstance(uploaded_file, (bytes, bytearray)):
+        return bytes(uploaded_file)
+    if isinstance(uploaded_file, (str, os.PathLike)):
+        with open(uploaded_file, 'rb') as f:
+            return f.read()
+    if hasattr(uploaded_file, 'getvalue'):
+        return uploaded_file.getvalue()
+    uploaded_file.seek(0)
+    return uploaded_file.read()
+
+def _extract_pages(data, indexes):
+    """Extract text for the given page indexes. Runs in worker processes for large files."""
+    reader = PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in indexes]
+
+def _disk_path(file_hash):
+    return os.path.join(PDF_CACHE_DIR, f"{file_hash}.json")
+
+def _load_from_disk(file_hash):
+    try:
+        with open(_disk_path(file_hash)) as f:
+            entry = json.load(f)
+        return {'page_count': entry['page_count'],
+                'pages': {int(i): text for i, text in entry['pages'].items()}}
+    except (OSError, ValueError, KeyError):
+        return None
+
+def _save_to_disk(file_hash, entry):
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{_disk_path(file_hash)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, _disk_path(file_hash))
+
+def _get_entry(file_hash, data, use_disk_cache):
+    with _cache_lock:
+        entry = _pdf_cache.get(file_hash)
+        if entry is not None:
+            _pdf_cache.move_to_end(file_hash)
+            return entry
+    entry = _load_from_disk(file_hash) if use_disk_cache else None
+    if entry is None:
+        entry = {'page_count': len(PdfReader(io.BytesIO(data)).pages), 'pages': {}}
+    with _cache_lock:
+        entry = _pdf_cache.setdefault(file_hash, entry)
+        _pdf_cache.move_to_end(file_hash)
+        while len(_pdf_cache) > PDF_CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
+    return entry
+
+def read_pdf_pages(uploaded_file, max_pages=None, use_disk_cache=PDF_DISK_CACHE, parallel=True):
+    """
+    Return the text of each page, extracting only pages that are not cached yet.
+    Results are cached by file hash in memory (LRU) and optionally on disk.
+    Pass max_pages to stop after the first pages of the document, and
+    parallel=False when already running inside a worker process.
+    """
+    data = _file_bytes(uploaded_file)
+    file_hash = hashlib.sha256(data).hexdigest()
+    entry = _get_entry(file_hash, data, use_disk_cache)
+
+    page_count = entry['page_count']
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    missing = [i for i in range(page_count) if i not in entry['pages']]
+    if missing:
+        if parallel and len(missing) > PARALLEL_PAGE_THRESHOLD:
+            workers = min(PDF_WORKERS, len(missing))
+            chunks = [missing[i::workers] for i in range(workers)]
+            results = get_process_pool().map(_extract_pages, [data] * workers, chunks)
+            for chunk, texts in zip(chunks, results):
+                entry['pages'].update(zip(chunk, texts))
+        else:
+            entry['pages'].update(zip(missing, _extract_pages(data, missing)))
+        if use_disk_cache:
+            _save_to_disk(file_hash, entry)
+
+    return [entry['pages'][i] for i in range(page_count)]
+
+def read_pdf(uploaded_file, max_pages=None):
+    """Return the resume text, joined from the cached page texts."""
+    return "".join(read_pdf_pages(uploaded_file, max_pages=max_pages))
@@ -0,0 +1,164 @@
+import os
+import re
+import threading
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+SKILL_VECTOR_DIM = 512
+SKILL_SIMILARITY_THRESHOLD = 0.7
+SKILL_VECTOR_CACHE = 'skill_vectors.npz'
+
+# Canonical skill names and the spellings that should map onto them
+SKILL_ALIASES = {
+    'postgresql': ['postgres', 'postgre sql', 'psql', 'pgsql'],
+    'mysql': ['my sql'],
+    'microsoft sql server': ['mssql', 'ms sql', 'sql server'],
+    'mongodb': ['mongo', 'mongo db'],
+    'machine learning': ['ml'],
+    'deep learning': ['dl'],
+    'artificial intelligence': ['ai'],
+    'natural language processing': ['nlp'],
+    'large language models': ['llm', 'llms'],
+    'javascript': ['js', 'java script', 'ecmascript'],
+    'typescript': ['ts'],
+    'node.js': ['node', 'nodejs', 'node js'],
+    'react': ['reactjs', 'react.js', 'react js'],
+    'angular': ['angularjs', 'angular.js', 'angular js'],
+    'vue.js': ['vue', 'vuejs', 'vue js'],
+    'next.js': ['nextjs', 'next js'],
+    'express.js': ['express', 'expressjs'],
+    'python': ['python3', 'py'],
+    'golang': ['go', 'go lang'],
+    'c++': ['cpp', 'c plus plus'],
+    'c#': ['csharp', 'c sharp'],
+    '.net': ['dotnet', 'dot net', 'asp.net'],
+    'amazon web services': ['aws'],
+    'google cloud platform': ['gcp', 'google cloud'],
+    'microsoft azure': ['azure'],
+    'kubernetes': ['k8s', 'kube'],
+    'docker': ['docker containers'],
+    'ci/cd': ['cicd', 'ci cd', 'continuous integration', 'continuous delivery'],
+    'rest api': ['rest', 'restful', 'restful api', 'rest apis', 'restful apis'],
+    'graphql': ['graph ql'],
+    'html': ['html5'],
+    'css': ['css3'],
+    'scikit-learn': ['sklearn', 'scikit learn'],
+    'tensorflow': ['tf', 'tensor flow'],
+    'pytorch': ['torch', 'py torch'],
+    'power bi': ['powerbi'],
+    'microsoft excel': ['excel', 'ms excel', 'advanced excel'],
+    'data structures and algorithms': ['dsa'],
+    'object oriented programming': ['oop', 'oops'],
+    'spring boot': ['springboot'],
+    'user interface design': ['ui', 'ui design'],
+    'user experience design': ['ux', 'ux design'],
+    'search engine optimization': ['seo'],
+    'business intelligence': ['bi'],
+    'extract transform load': ['etl'],
+    'quality assurance': ['qa'],
+}
+
+_ALIAS_TO_CANONICAL = {alias: canonical for canonical, aliases in SKILL_ALIASES.items() for alias in aliases}
+_SEPARATOR_PATTERN = re.compile(r'[\s_\-/]+')
+
+@lru_cache(maxsize=4096)
+def canonicalize_skill(skill):
+    """Lowercase, collapse separators and map known aliases onto one canonical name."""
+    skill = skill.strip().lower()
+    if skill in SKILL_ALIASES or skill in _ALIAS_TO_CANONICAL:
+        return _ALIAS_TO_CANONICAL.get(skill, skill)
+    normalized = _SEPARATOR_PATTERN.sub(' ', skill).strip(' .,;:')
+    return _ALIAS_TO_CANONICAL.get(normalized, normalized)
+
+def _compute_vector(skill):
+    """Hashed character trigram + word vector, L2-normalized. Needs no model download or network."""
+    vector = np.zeros(SKILL_VECTOR_DIM, dtype=np.float32)
+    padded = f"  {skill}  "
+    for i in range(len(padded) - 2):
+        vector[zlib.crc32(padded[i:i + 3].encode()) % SKILL_VECTOR_DIM] += 1.0
+    for word in skill.split():
+        vector[zlib.crc32(f"w:{word}".encode()) % SKILL_VECTOR_DIM] += 2.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class SkillVectorIndex:
+    """
+    Vectors for canonical skills, precomputed for the alias vocabulary and
+    extended with every resume or job skill seen. Persisted to an .npz file so
+    later runs reuse them.
+    """
+
+    def __init__(self, path=SKILL_VECTOR_CACHE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._vectors = {}
+        self._dirty = False
+        self._load()
+        self.vectors_for(list(SKILL_ALIASES))
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                if data['vectors'].shape[1] == SKILL_VECTOR_DIM:
+                    self._vectors = dict(zip(data['skills'].tolist(), data['vectors']))
+        except (OSError, ValueError, KeyError):
+            self._vectors = {}
+
+    def save(self):
+        """Write the vectors to disk if new skills were added."""
+        with self._lock:
+            if not self._dirty:
+                return
+            skills = list(self._vectors)
+            vectors = np.stack([self._vectors[skill] for skill in skills])
+            self._dirty = False
+        tmp_path = f"{self.path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, skills=np.array(skills), vectors=vectors)
+        os.replace(tmp_path, self.path)
+
+    def vectors_for(self, skills):
+        """Return a (len(skills) x dim) matrix for canonical skill names."""
+        with self._lock:
+            missing = [skill for skill in skills if skill not in self._vectors]
+            for skill in missing:
+                self._vectors[skill] = _compute_vector(skill)
+            if missing:
+                self._dirty = True
+            if not skills:
+                return np.zeros((0, SKILL_VECTOR_DIM), dtype=np.float32)
+            return np.stack([self._vectors[skill] for skill in skills])
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_skill_index():
+    """Return the process-wide skill vector index, loading it on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SkillVectorIndex()
+        return _index
+
+@lru_cache(maxsize=64)
+def _user_skill_matrix(user_skills):
+    canonical = sorted({canonicalize_skill(skill) for skill in user_skills if skill.strip()})
+    return get_skill_index().vectors_for(canonical)
+
+def match_percentage(job_skills, user_skills, threshold=SKILL_SIMILARITY_THRESHOLD):
+    """
+    Percentage of job skills covered by the user's skills. A job skill counts when
+    its canonical form equals, or its vector is within threshold cosine similarity
+    of, any user skill. Each job is scored with one matrix product.
+    """
+    if not job_skills:
+        return 0
+    user_matrix = _user_skill_matrix(tuple(user_skills))
+    if not len(user_matrix):
+        return 0.0
+    job_matrix = get_skill_index().vectors_for([canonicalize_skill(skill) for skill in job_skills])
+    best_similarity = (job_matrix @ user_matrix.T).max(axis=1)
+    return float((best_similarity >= threshold - 1e-6).mean() * 100)
@@ -0,0 +1,113 @@
+import hashlib
+import re
+
+from cache import normalize_text
+from database import get_stored_skill_profile, save_skill_profile
+from skill_matching import SKILL_ALIASES, canonicalize_skill
+
+PROFILE_PROMPT = """
+Extract a structured profile from this resume. Respond with JSON only, in exactly this form:
+{"skills": ["..."], "years_experience": 0, "titles": ["..."]}
+- skills: technical skills, tools and technologies, lowercase, one skill per entry
+- years_experience: total years of professional experience as a number (0 if none)
+- titles: job titles the candidate has held, most recent first
+"""
+
+# Skills recognised by the local fallback, on top of the alias vocabulary
+LOCAL_SKILLS = (
+    'python', 'java', 'sql', 'nosql', 'scala', 'kotlin', 'swift', 'ruby', 'php', 'rust', 'bash',
+    'linux', 'git', 'github', 'jenkins', 'terraform', 'ansible', 'docker', 'kafka', 'spark', 'hadoop',
+    'airflow', 'redis', 'elasticsearch', 'rabbitmq', 'django', 'flask', 'fastapi', 'spring', 'hibernate',
+    'microservices', 'selenium', 'jira', 'figma', 'pandas', 'numpy', 'matplotlib', 'keras', 'opencv',
+    'tableau', 'snowflake', 'databricks', 'bigquery', 'firebase', 'flutter', 'android', 'ios', 'redux',
+    'tailwind', 'bootstrap', 'jquery', 'sass', 'webpack', 'jest', 'pytest', 'junit', 'oracle', 'sqlite',
+    'data analysis', 'data visualization', 'statistics', 'agile', 'scrum',
+)
+
+_TITLE_PATTERN = re.compile(
+    r'\b((?:senior|sr\.?|junior|jr\.?|lead|principal|staff|associate)?\s*'
+    r'(?:software|data|backend|back[- ]end|frontend|front[- ]end|full[- ]?stack|machine learning|ml|ai|devops|'
+    r'cloud|web|mobile|android|ios|qa|test|python|java|business|product|site reliability)\s+'
+    r'(?:engineer|developer|scientist|analyst|architect|intern|manager|consultant))\b',
+    re.IGNORECASE,
+)
+_YEARS_PATTERN = re.compile(r'(\d{1,2}(?:\.\d+)?)\s*\+?\s*(?:years|yrs)', re.IGNORECASE)
+
+# Aliases that are ordinary English words or too short to scan for in free text
+AMBIGUOUS_ALIASES = {'go', 'rest', 'express', 'excel', 'node', 'torch', 'kube', 'ts', 'tf', 'py', 'bi', 'dl'}
+
+def _build_skill_pattern():
+    terms = set(LOCAL_SKILLS) | set(SKILL_ALIASES)
+    for aliases in SKILL_ALIASES.values():
+        terms.update(aliases)
+    terms -= AMBIGUOUS_ALIASES
+    alternation = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf'(?<![\w+#.])({alternation})(?![\w+#])', re.IGNORECASE)
+
+_SKILL_PATTERN = _build_skill_pattern()
+
+def resume_hash(resume_text):
+    return hashlib.sha256(normalize_text(resume_text).encode()).hexdigest()
+
+def _unique(items):
+    seen = set()
+    return [item for item in items if item and not (item in seen or seen.add(item))]
+
+def normalize_profile(profile, source):
+    """Canonicalize skills and coerce the profile fields to their stored types."""
+    skills = profile.get('skills') or []
+    if isinstance(skills, str):
+        skills = re.split(r'[,\n;]', skills)
+    try:
+        years_experience = float(profile.get('years_experience') or 0)
+    except (TypeError, ValueError):
+        years_experience = 0.0
+    titles = profile.get('titles') or []
+    if isinstance(titles, str):
+        titles = [titles]
+    return {
+        'skills': _unique(canonicalize_skill(str(skill).strip(' -*•')) for skill in skills),
+        'years_experience': years_experience,
+        'titles': _unique(str(title).strip() for title in titles),
+        'source': source
+    }
+
+def extract_profile_locally(resume_text):
+    """Build a profile from the keyword dictionary and regexes, without any API call."""
+    years = [float(value) for value in _YEARS_PATTERN.findall(resume_text) if float(value) <= 50]
+    profile = {
+        'skills': [match.lower() for match in _SKILL_PATTERN.findall(resume_text)],
+        'years_experience': max(years) if years else 0,
+        'titles': [' '.join(match.split()).title() for match in _TITLE_PATTERN.findall(resume_text)],
+    }
+    return normalize_profile(profile, 'local')
+
+def extract_profile_with_gemini(client, resume_text):
+    """Ask Gemini for the profile as structured JSON."""
+    profile = client.generate_json([resume_text, PROFILE_PROMPT])
+    if not isinstance(profile, dict) or not profile.get('skills'):
+        raise ValueError("Gemini returned an empty skill profile")
+    return normalize_profile(profile, 'gemini')
+
+def load_skill_profile(resume_text, client=None):
+    """
+    Return the stored skill profile for this resume, building it on first use:
+    structured Gemini output when a client is given, else (or on failure) the
+    local keyword dictionary. Once a Gemini profile is stored, later calls for
+    the same resume make no API calls. A stored local profile is upgraded when
+    a client is given, and a local fallback after a failed Gemini call (quota,
+    timeout, missing key) is not stored, so the next call tries Gemini again.
+    """
+    key = resume_hash(resume_text)
+    stored = get_stored_skill_profile(key)
+    if stored is not None and (stored['source'] != 'local' or client is None):
+        return stored
+    if client is not None:
+        try:
+            profile = extract_profile_with_gemini(client, resume_text)
+        except Exception:
+            return stored or extract_profile_locally(resume_text)
+    else:
+        profile = extract_profile_locally(resume_text)
+    save_skill_profile(key, profile)
+    return profile
@@ -0,0 +1,84 @@
+"""
+Offline checks of the page parsers against saved HTML in tests/fixtures.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auto_apply import parse_job_page, parse_search_page, evaluate_job, card_qualifies, score_job
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+PAGE_URL = "https://www.naukri.com/python-jobs"
+
+def load(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+def test_job_page_reads_every_field():
+    info = parse_job_page(load('job_page_full.html'))
+    assert info['designation'] == "Backend Engineer"
+    assert info['company_name'] == "Acme Corp"
+    assert info['yoe'] == 3
+    assert info['skill'] == ["python", "django", "sql"]
+    assert info['posted_days'] == 4
+
+def test_job_page_single_value_salary():
+    info = parse_job_page(load('job_page_full.html'))
+    assert info['salary'] == [12.0]
+    assert evaluate_job(info, 5, 10, ["python", "django", "sql"], 0.5) == (True, "qualified", 100.0)
+    assert evaluate_job(info, 5, 15, ["python"], 0.5)[:2] == (False, "salary")
+
+def test_single_value_salary_ranks_as_its_upper_figure():
+    info = parse_job_page(load('job_page_full.html'))
+    score = score_job(info, 5, 9, 100)
+    assert score == score_job({**info, 'salary': [6.0, 12.0]}, 5, 9, 100)
+    assert score < score_job({**info, 'salary': [0, 0]}, 5, 9, 100)
+
+def test_job_page_missing_fields_and_undisclosed_salary():
+    info = parse_job_page(load('job_page_sparse.html'))
+    assert info == {
+        'skill': [],
+        'yoe': 0,
+        'salary': [0, 0],
+        'company_name': "Unknown Company",
+        'designation': "Data Analyst",
+        'posted_days': None
+    }
+    assert evaluate_job(info, 2, 0, ["sql"], 0)[:2] == (True, "qualified")
+    assert evaluate_job({**info, 'salary': []}, 2, 5, ["sql"], 0)[:2] == (False, "salary")
+
+def test_search_page_cards():
+    cards = parse_search_page(load('search_page_cards.html'), PAGE_URL)
+    assert [card['title'] for card in cards] == ["Backend Engineer", "Data Analyst", "QA Engineer"]
+    full, single, undisclosed = cards
+    assert full == {
+        'url': "https://www.naukri.com/job-listings-backend-engineer-acme-3-to-5-years-150126000001",
+        'title': "Backend Engineer",
+        'company': "Acme Corp",
+        'yoe': 3,
+        'salary': [6.0, 10.0],
+        'location': "Bengaluru",
+        'tags': ["python", "django"]
+    }
+    assert single['url'] == "https://www.naukri.com/job-listings-data-analyst-globex-1-to-3-years-150126000002?src=srp"
+    assert single['salary'] == [12.0]
+    assert (single['company'], single['yoe'], single['location'], single['tags']) == (None, None, None, [])
+    assert undisclosed['salary'] == [0, 0]
+
+def test_search_card_filters_with_missing_fields():
+    full, single, undisclosed = parse_search_page(load('search_page_cards.html'), PAGE_URL)
+    assert card_qualifies(single, 0, 12, ["python"], 0.5)[0]
+    assert card_qualifies(single, 0, 13, ["python"], 0.5) == (False, "salary")
+    assert card_qualifies(full, 2, 0, ["python"], 0.5) == (False, "experience")
+
+def test_search_page_falls_back_to_bare_links():
+    cards = parse_search_page(load('search_page_links.html'), PAGE_URL)
+    assert [card['url'] for card in cards] == [
+        "https://www.naukri.com/job-listings-devops-engineer-umbrella-150126000004",
+        "https://www.naukri.com/job-listings-sre-umbrella-150126000005",
+    ]
+    for card in cards:
+        assert (card['company'], card['yoe'], card['salary'], card['location'], card['tags']) == (None, None, None, None, [])